@@ -0,0 +1,43 @@
+import argparse
+import random
+import time
+from task_03 import normalize_phone, normalize_phones
+
+def generate_numbers(count: int, invalid_share: float) -> list[str]:
+    """Generates raw phone numbers in the formats handled by `normalize_phone`."""
+    formats = ["0{}{} {}{}{} {}{} {}{}", "(0{}{}) {}{}{}-{}{}{}{}", "+380 {}{} {}{}{} {}{}{}{}", "380{}{}{}{}{}{}{}{}{}", "    +38(0{}{}){}{}{}-{}{}-{}{}"]
+    numbers = []
+    for _ in range(count):
+        digits = [random.choice("0123456789") for _ in range(9)]
+        number = random.choice(formats).format(*digits)
+        if random.random() < invalid_share:
+            number = number[:-2]
+        numbers.append(number)
+    return numbers
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of normalize_phone vs bulk normalize_phones.")
+    parser.add_argument('-n', '--count', type=int, default=1_000_000, help="Amount of raw numbers.")
+    parser.add_argument('-i', '--invalid', type=float, default=0.05, help="Share of invalid numbers.")
+    args = parser.parse_args()
+
+    numbers = generate_numbers(args.count, args.invalid)
+
+    start = time.perf_counter()
+    for number in numbers:
+        try:
+            normalize_phone(number)
+        except ValueError:
+            pass
+    per_call = time.perf_counter() - start
+
+    start = time.perf_counter()
+    valid, invalid = normalize_phones(numbers)
+    bulk = time.perf_counter() - start
+
+    print(f"normalize_phone  : {per_call:.3f}s ({args.count / per_call:,.0f} numbers/s)")
+    print(f"normalize_phones : {bulk:.3f}s ({args.count / bulk:,.0f} numbers/s), {len(valid)} valid, {len(invalid)} invalid")
+    print(f"Speedup: {per_call / bulk:.1f}x")
+
+if __name__ == '__main__':
+    main()
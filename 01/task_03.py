@@ -1,4 +1,12 @@
 import re
+from itertools import islice
+from typing import Iterable, Iterator
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:
+    np = None
 
 def normalize_phone(phone_number:str)->str:
     r"""Normalizes the input phone number to the format +38XXXXXXXXX.
@@ -48,18 +56,188 @@ def normalize_phone(phone_number:str)->str:
     
     return phone_number
 
-raw_numbers = [
-    "067\\t123 4567",
-    "(095) 234-5678\\n",
-    "+380 44 123 4567",
-    "380501234567",
-    "    +38(050)123-32-34",
-    "     0503451234",
-    "(050)8889900",
-    "38050-111-22-22",
-    "38050 111 22 11   ",
-    #"38050 111 22 1   ", # Error value
-]
-
-sanitized_numbers = [normalize_phone(num) for num in raw_numbers]
-print("Нормалізовані номери телефонів для SMS-розсилки:", sanitized_numbers)
\ No newline at end of file
+# Bytes kept by the bulk normalizer: digits, '+', '?' (kept, like in `normalize_phone`,
+# so such numbers stay invalid) and the row separator. Everything else is deleted.
+_KEEP_BYTES = b"0123456789+?\n"
+_DELETE_BYTES = bytes(b for b in range(256) if b not in _KEEP_BYTES)
+
+def _classify_rows(block: bytes) -> tuple[list[str], list[int]]:
+    r"""Validates cleaned numbers (one per line of the block) and adds the country code.
+
+    Uses NumPy to process the whole block with array operations when it is installed.
+
+    Returns
+    -------
+    valid, invalid
+        Normalized numbers and positions of the invalid rows in the block.
+    """
+    if np is not None:
+        return _classify_rows_numpy(block)
+
+    rows = block.decode("ascii").split("\n")
+    # Mirrors `normalize_phone`: '+' and 10 or '38' + 10 digits are kept as they are,
+    # numbers starting with '38' get '+', other 10 digit numbers get '+38'.
+    normalized = [('+' + x if x[:2] == '38' else '+38' + x) if x.isdigit() and (len(x) == 10 or (len(x) == 12 and x[:2] == '38'))
+                  else x if x[:1] == '+' and x[1:].isdigit() and (len(x) == 11 or (len(x) == 13 and x[1:3] == '38'))
+                  else '' for x in rows]
+    return list(filter(None, normalized)), [i for i, x in enumerate(normalized) if not x]
+
+def _classify_rows_numpy(block: bytes) -> tuple[list[str], list[int]]:
+    # Separators in front of the block let every row be viewed as its last 13 bytes.
+    data = np.frombuffer(b"\n" * 13 + block + b"\n", dtype=np.uint8)
+    ends = np.flatnonzero(data == ord("\n"))[13:]
+    lengths = np.diff(ends, prepend=12) - 1
+
+    # Only rows of 10-13 characters can be valid: check their last 10 characters are digits
+    # and the characters before them form an allowed prefix ('', '+', '38' or '+38').
+    candidates = np.flatnonzero((lengths >= 10) & (lengths <= 13))
+    row_lengths = lengths[candidates]
+    windows = sliding_window_view(data, 13)[ends[candidates] - 13]
+    tails = windows[:, 3:]
+
+    digits = ((tails >= ord("0")) & (tails <= ord("9"))).all(axis=1)
+    has_38 = (windows[:, 1] == ord("3")) & (windows[:, 2] == ord("8"))
+    ok = digits & ((row_lengths == 10)
+                   | ((row_lengths == 11) & (windows[:, 2] == ord("+")))
+                   | ((row_lengths == 12) & has_38)
+                   | ((row_lengths == 13) & has_38 & (windows[:, 0] == ord("+"))))
+    valid = np.zeros(len(ends), dtype=bool)
+    valid[candidates[ok]] = True
+
+    # Every normalized number is '+' or '+38' followed by the last 10 digits of the row:
+    # write them into 14 byte records, then cut the unused bytes of the short ones.
+    tails = tails[ok]
+    row_lengths = row_lengths[ok]
+    short = (row_lengths == 11) | ((row_lengths == 10) & (tails[:, 0] == ord("3")) & (tails[:, 1] == ord("8")))
+    out = np.empty((len(tails), 14), dtype=np.uint8)
+    out[:, 0] = ord("+")
+    out[:, 1] = ord("3")
+    out[:, 2] = ord("8")
+    out[:, 3:13] = tails
+    out[:, 13] = ord("\n")
+    out[short, 1:11] = tails[short]
+    out[short, 11] = ord("\n")
+    keep = np.ones(out.shape, dtype=bool)
+    keep[short, 12:] = False
+
+    normalized = out[keep].tobytes().decode("ascii").split("\n")[:-1]
+    return normalized, np.flatnonzero(~valid).tolist()
+
+def _normalize_block(block: bytes, first_index: int, raw_row) -> tuple[list[str], list[tuple[int, str]]]:
+    valid, invalid = _classify_rows(block)
+    return valid, [(first_index + i, raw_row(i)) for i in invalid]
+
+def iter_normalize_phones(phone_numbers: Iterable[str], chunk_size: int = 100_000) -> Iterator[tuple[list[str], list[tuple[int, str]]]]:
+    r"""Normalizes phone numbers in chunks, without raising on invalid numbers.
+
+    Each chunk is joined into one bytes block, cleaned with a single `bytes.translate`
+    call instead of a regex substitution per number and validated as a whole (with NumPy
+    array operations when NumPy is installed). Only ASCII digits are accepted.
+
+    Parameters
+    ----------
+    phone_numbers
+        Raw phone numbers in various formats.
+    chunk_size
+        Amount of numbers processed at once.
+
+    Yields
+    ------
+    valid, invalid
+        Normalized numbers of the chunk and (row index, raw number) pairs of its invalid numbers.
+    """
+    phone_numbers = iter(phone_numbers)
+    first_index = 0
+    while chunk := list(islice(phone_numbers, chunk_size)):
+        block = "\n".join(chunk).encode("utf-8", "replace").translate(None, _DELETE_BYTES)
+        if block.count(b"\n") != len(chunk) - 1:
+            # Some numbers contain line breaks themselves; clean them one by one.
+            block = b"\n".join(num.encode("utf-8", "replace").translate(None, _DELETE_BYTES + b"\n") for num in chunk)
+        yield _normalize_block(block, first_index, chunk.__getitem__)
+        first_index += len(chunk)
+
+def normalize_phones(phone_numbers: Iterable[str], chunk_size: int = 100_000) -> tuple[list[str], list[tuple[int, str]]]:
+    r"""Normalizes many phone numbers to the format +38XXXXXXXXX.
+
+    Parameters
+    ----------
+    phone_numbers
+        Raw phone numbers in various formats.
+    chunk_size
+        Amount of numbers processed at once.
+
+    Returns
+    -------
+    valid, invalid
+        Normalized numbers and (row index, raw number) pairs of the invalid numbers.
+    """
+    valid = []
+    invalid = []
+    for chunk_valid, chunk_invalid in iter_normalize_phones(phone_numbers, chunk_size):
+        valid.extend(chunk_valid)
+        invalid.extend(chunk_invalid)
+    return valid, invalid
+
+def iter_normalize_phones_file(path: str, block_size: int = 1 << 22) -> Iterator[tuple[list[str], list[tuple[int, str]]]]:
+    r"""Normalizes phone numbers from a file with one number per line, block by block.
+
+    Parameters
+    ----------
+    path
+        Path to the file with raw phone numbers.
+    block_size
+        Size of the blocks read from the file, in bytes.
+
+    Yields
+    ------
+    valid, invalid
+        Normalized numbers of the block and (line index, raw line) pairs of its invalid numbers.
+    """
+    first_index = 0
+    tail = b""
+    with open(path, "rb") as file:
+        while True:
+            block = file.read(block_size)
+            at_eof = not block
+            block = tail + block
+            if at_eof:
+                if not block:
+                    break
+                tail = b""
+            else:
+                cut = block.rfind(b"\n") + 1
+                block, tail = block[:cut], block[cut:]
+                if not block:
+                    continue
+                # Drop the separator after the last line of the block.
+                block = block[:-1]
+
+            raw_rows = None
+
+            def raw_row(i: int) -> str:
+                nonlocal raw_rows
+                if raw_rows is None:
+                    raw_rows = block.split(b"\n")
+                return raw_rows[i].decode("utf-8", "replace").rstrip("\r")
+
+            yield _normalize_block(block.translate(None, _DELETE_BYTES), first_index, raw_row)
+            first_index += block.count(b"\n") + 1
+            if at_eof:
+                break
+
+if __name__ == '__main__':
+    raw_numbers = [
+        "067\\t123 4567",
+        "(095) 234-5678\\n",
+        "+380 44 123 4567",
+        "380501234567",
+        "    +38(050)123-32-34",
+        "     0503451234",
+        "(050)8889900",
+        "38050-111-22-22",
+        "38050 111 22 11   ",
+        #"38050 111 22 1   ", # Error value
+    ]
+
+    sanitized_numbers = [normalize_phone(num) for num in raw_numbers]
+    print("Нормалізовані номери телефонів для SMS-розсилки:", sanitized_numbers)
\ No newline at end of file
@@ -0,0 +1,65 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from task02 import CatRegistry, get_cats_info
+
+NAMES = ["Tayson", "Vika", "Barsik", "Simon", "Tessi", "Murzik", "Luna", "Kuzya", "Pushok", "Ryzhik"]
+
+def generate_cats(path: str, count: int) -> list[str]:
+    """Writes `count` cats with unique identifiers and returns the identifiers."""
+    ids = [f"{random.getrandbits(96):024x}" for _ in range(count)]
+    with open(path, 'w', encoding='utf-8') as file:
+        for guid in ids:
+            file.write(f"{guid},{random.choice(NAMES)}{random.randint(0, 999)},{random.randint(0, 20)}\n")
+    return ids
+
+def measure(label: str, load) -> tuple[object, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<14}: load {elapsed:.2f}s, {memory / 2**20:,.1f} MiB")
+    return result
+
+def timed(label: str, func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    per_call = (time.perf_counter() - start) / repeat
+    print(f"  {label:<22}: {per_call * 1e6:,.1f} µs per lookup")
+    return per_call
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of CatRegistry vs the list of dicts from get_cats_info.")
+    parser.add_argument('-n', '--count', type=int, default=5_000_000, help="Amount of cats in the generated file.")
+    parser.add_argument('-l', '--lookups', type=int, default=10, help="Amount of lookups with a linear scan.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "cats.txt")
+        ids = generate_cats(path, args.count)
+        probes = random.sample(ids, min(args.lookups, len(ids)))
+
+        cats_info = measure("list of dicts", lambda: get_cats_info(path))
+        def scan(guid: str) -> dict:
+            return next(cat for cat in cats_info if cat["id"] == guid)
+
+        scan_id = timed("by id (scan)", lambda: scan(random.choice(probes)), args.lookups)
+        timed("by name (scan)", lambda: [cat for cat in cats_info if cat["name"] == "Luna7"], 3)
+        timed("by age 3-5 (scan)", lambda: [cat for cat in cats_info if 3 <= cat["age"] <= 5], 3)
+        del cats_info
+
+        registry = CatRegistry()
+        measure("CatRegistry", lambda: registry.load(path))
+        index_id = timed("by id (index)", lambda: registry.get(random.choice(probes)), 100_000)
+        timed("by name (index)", lambda: registry.find_by_name("Luna7"), 1000)
+        timed("by age 3-5 (index)", lambda: registry.find_by_age(3, 5), 3)
+        print(f"Lookup by id speedup: {scan_id / index_id:,.0f}x")
+
+if __name__ == '__main__':
+    main()
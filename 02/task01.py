@@ -1,4 +1,407 @@
+import argparse
+import math
+import random
+from array import array
+from operator import mul
 from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang and Liberty, "Optimal Quantile Approximation in Streams").
+
+    Values are kept in a hierarchy of compactors; a full compactor sorts its values and
+    promotes every other one (randomly the odd or the even ones) to the next level, where
+    each value stands for twice as many original values. Memory is O(k) whatever the
+    number of values, and the rank error of a quantile is about 1.7 / k of the count
+    (under 1% with the default `k`). Sketches of different parts of the data can be
+    merged into a sketch of the whole data with the same guarantee.
+    """
+    __slots__ = ("k", "compactors", "count", "_size", "_max_size", "_rng")
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        """
+        Parameters:
+            k (int): Capacity of the top compactor; bigger is more accurate.
+            seed (int): Seed of the random choices, for reproducible results.
+        """
+        self.k = k
+        self.compactors = [[]]
+        self.count = 0
+        self._size = 0
+        self._max_size = 0
+        self._rng = random.Random(seed)
+        self._update_max_size()
+
+    def _capacity(self, level: int) -> int:
+        # Lower levels get geometrically smaller capacities.
+        return int(math.ceil(self.k * (2 / 3) ** (len(self.compactors) - level - 1))) + 1
+
+    def _update_max_size(self) -> None:
+        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def add(self, value: int) -> None:
+        """Add a value."""
+        self.compactors[0].append(value)
+        self.count += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def add_many(self, values: Iterable[int]) -> None:
+        """Add many values at once; the compaction sorts whole blocks."""
+        size = len(self.compactors[0])
+        self.compactors[0].extend(values)
+        added = len(self.compactors[0]) - size
+        self.count += added
+        self._size += added
+        while self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Add the values summarized by another sketch.
+
+        Returns:
+            KLLSketch: This sketch.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self._size = sum(len(items) for items in self.compactors)
+        self._update_max_size()
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _compress(self) -> None:
+        for level, items in enumerate(self.compactors):
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self.compactors):
+                self.compactors.append([])
+                self._update_max_size()
+            items.sort()
+            # An odd value out stays at its level.
+            kept = [items.pop()] if len(items) % 2 else []
+            promoted = items[self._rng.getrandbits(1)::2]
+            self.compactors[level + 1].extend(promoted)
+            self.compactors[level] = kept
+            self._size -= len(items) - len(promoted)
+            if self._size < self._max_size:
+                break
+
+    def quantile(self, q: float) -> int:
+        """Approximate quantile.
+
+        Parameters:
+            q (float): Quantile between 0 and 1, e.g. 0.99 for the 99th percentile.
+
+        Returns:
+            int: A value whose rank is about `q` of the count.
+
+        Raises:
+            ValueError: If the sketch is empty or `q` is out of range.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1: {q}.")
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.compactors) for value in items)
+        if not weighted:
+            raise ValueError("No values in the sketch.")
+        total = sum(weight for _, weight in weighted)
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= q * total:
+                return value
+        return weighted[-1][0]
+
+class SalaryStats:
+    """Running aggregates of salaries, kept in constant memory.
+
+    The total is an exact integer; the spread is tracked with Welford's online algorithm,
+    so the mean and variance stay accurate for any number of rows. Two aggregates can
+    be merged, e.g. the results of several files or processes.
+
+    Attributes:
+        count (int): Amount of salaries.
+        total (int): Sum of the salaries.
+        minimum (int): The smallest salary, None if there are no salaries.
+        maximum (int): The biggest salary, None if there are no salaries.
+        bad_lines (list[int]): Numbers (starting from 1) of the malformed lines skipped by
+            `salary_stats` in the error-tolerant mode.
+        sketch (KLLSketch): Quantile sketch of the salaries, None if percentiles are not tracked.
+    """
+    __slots__ = ("count", "total", "minimum", "maximum", "_mean", "_m2", "bad_lines", "sketch")
+
+    def __init__(self, sketch: KLLSketch = None) -> None:
+        """
+        Parameters:
+            sketch (KLLSketch): Empty quantile sketch to track percentiles with.
+        """
+        self.sketch = sketch
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.bad_lines = []
+
+    def add(self, salary: int) -> None:
+        """Account one salary."""
+        self.count += 1
+        self.total += salary
+        if self.minimum is None or salary < self.minimum:
+            self.minimum = salary
+        if self.maximum is None or salary > self.maximum:
+            self.maximum = salary
+        if self.sketch is not None:
+            self.sketch.add(salary)
+        delta = salary - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (salary - self._mean)
+
+    def add_block(self, salaries: Sequence[int]) -> None:
+        """Account a block of salaries at once.
+
+        The block aggregates are computed by NumPy over an `array('q')` block when NumPy is
+        installed, otherwise by built-in functions over the sequence; then the block is
+        merged like another aggregate.
+        """
+        if not salaries:
+            return
+        block = SalaryStats()
+        block.count = len(salaries)
+        if np is not None and isinstance(salaries, array):
+            values = np.frombuffer(salaries, dtype=np.int64)
+            block.minimum = int(values.min())
+            block.maximum = int(values.max())
+            if max(-block.minimum, block.maximum) < (1 << 63) // block.count:
+                block.total = int(values.sum())
+            else:
+                # The int64 sum could overflow.
+                block.total = sum(salaries)
+            block._m2 = float(values.var()) * block.count
+        else:
+            block.total = sum(salaries)
+            block.minimum = min(salaries)
+            block.maximum = max(salaries)
+            # Exact integer arithmetic: n * sum(x^2) - sum(x)^2 = n * sum((x - mean)^2).
+            block._m2 = (block.count * sum(map(mul, salaries, salaries)) - block.total * block.total) / block.count
+        block._mean = block.total / block.count
+        if self.sketch is not None:
+            self.sketch.add_many(salaries)
+        self._merge_moments(block)
+
+    def merge(self, other: "SalaryStats") -> "SalaryStats":
+        """Add the salaries of another aggregate to this one.
+
+        Parameters:
+            other (SalaryStats): Aggregate to merge.
+
+        Returns:
+            SalaryStats: This aggregate.
+        """
+        if self.sketch is not None:
+            if other.sketch is not None:
+                self.sketch.merge(other.sketch)
+            elif other.count:
+                # Percentiles of the other salaries are unknown.
+                self.sketch = None
+        elif other.sketch is not None and not self.count:
+            self.sketch = KLLSketch(other.sketch.k).merge(other.sketch)
+        self._merge_moments(other)
+        self.bad_lines.extend(other.bad_lines)
+        return self
+
+    def _merge_moments(self, other: "SalaryStats") -> None:
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        """Average salary."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the salaries."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation of the salaries."""
+        return self.variance ** 0.5
+
+    def percentile(self, p: float) -> int:
+        """Approximate percentile of the salaries (see `KLLSketch`).
+
+        Parameters:
+            p (float): Percentile between 0 and 100.
+
+        Returns:
+            int: The salary at the percentile.
+
+        Raises:
+            ValueError: If percentiles are not tracked or there are no salaries.
+        """
+        if self.sketch is None:
+            raise ValueError("Percentiles are not tracked.")
+        return self.sketch.quantile(p / 100)
+
+def salary_stats(path: str, strict: bool = True, vectorized: bool = True, block_size: int = 1 << 20,
+                 quantiles: bool = False) -> SalaryStats:
+    """Calculate running salary aggregates of developers from a file, reading it block by block.
+
+    Each line contains a developer's last name and salary, separated by a comma. Memory usage
+    doesn't depend on the file size.
+
+    Parameters:
+        path (str): The path to the text file containing salary information.
+        strict (bool): Raise on the first malformed line; otherwise skip such lines and collect
+            their numbers in `SalaryStats.bad_lines`.
+        vectorized (bool): Convert whole blocks of lines at once and aggregate them with NumPy
+            (over an `array`) or built-in functions; blocks with malformed lines are processed
+            line by line.
+        block_size (int): Approximate size of the blocks read at once, in bytes.
+        quantiles (bool): Track percentiles with a `KLLSketch`.
+
+    Returns:
+        SalaryStats: Aggregates of the salaries.
+
+    Raises:
+        FileNotFoundError
+            If the specified file does not exist.
+        ValueError
+            If a line is malformed and `strict` is set.
+    """
+
+    file_path = Path(path)
+
+    if not file_path.exists():
+        raise FileNotFoundError(f"Input file does not exist: {file_path.name}.")
+
+    stats = SalaryStats(KLLSketch() if quantiles else None)
+    line_number = 0
+
+    with file_path.open(mode='r', encoding='utf-8') as file:
+        while lines := file.readlines(block_size):
+            if vectorized:
+                try:
+                    # int() ignores the surrounding whitespace itself.
+                    salaries = map(int, [line.split(',')[1] for line in lines])
+                    block = array('q', salaries) if np is not None else list(salaries)
+                except (ValueError, IndexError, OverflowError):
+                    block = None
+                if block is not None:
+                    stats.add_block(block)
+                    line_number += len(lines)
+                    continue
+
+            for line in lines:
+                line_number += 1
+                try:
+                    # Retrieve salary.
+                    salary = int(line.strip().split(',')[1])
+                except (ValueError, IndexError):
+                    if strict:
+                        raise ValueError(f"Malformed line: {line.strip()}")
+                    stats.bad_lines.append(line_number)
+                    continue
+                stats.add(salary)
+
+    return stats
+
+def group_salary_stats(path: str, group_column: int, salary_column: int = 1, strict: bool = True,
+                       quantiles: bool = True, block_size: int = 1 << 20,
+                       bad_lines: Optional[list[int]] = None) -> dict[str, SalaryStats]:
+    """Calculate salary aggregates per group, e.g. per department, from a comma-separated file.
+
+    Parameters:
+        path (str): The path to the text file containing salary information.
+        group_column (int): Index of the column with the group name.
+        salary_column (int): Index of the column with the salary.
+        strict (bool): Raise on the first malformed line; otherwise skip such lines.
+        quantiles (bool): Track percentiles of every group with a `KLLSketch`.
+        block_size (int): Approximate size of the blocks read at once, in bytes.
+        bad_lines (list[int]): List collecting the numbers (starting from 1) of the skipped lines.
+
+    Returns:
+        dict[str, SalaryStats]: Aggregates by group name.
+
+    Raises:
+        FileNotFoundError
+            If the specified file does not exist.
+        ValueError
+            If a line is malformed and `strict` is set.
+    """
+
+    file_path = Path(path)
+
+    if not file_path.exists():
+        raise FileNotFoundError(f"Input file does not exist: {file_path.name}.")
+
+    groups = {}
+    line_number = 0
+
+    with file_path.open(mode='r', encoding='utf-8') as file:
+        while lines := file.readlines(block_size):
+            # Collect the block by group, then account every group at once.
+            block = {}
+            for line in lines:
+                line_number += 1
+                try:
+                    fields = line.strip().split(',')
+                    salary = int(fields[salary_column])
+                    group = fields[group_column].strip()
+                except (ValueError, IndexError):
+                    if strict:
+                        raise ValueError(f"Malformed line: {line.strip()}")
+                    if bad_lines is not None:
+                        bad_lines.append(line_number)
+                    continue
+                block.setdefault(group, []).append(salary)
+
+            for group, salaries in block.items():
+                if group not in groups:
+                    groups[group] = SalaryStats(KLLSketch() if quantiles else None)
+                groups[group].add_block(salaries)
+
+    return groups
+
+def merge_group_stats(parts: Iterable[dict[str, SalaryStats]]) -> dict[str, SalaryStats]:
+    """Combine per-group aggregates of several files or processes.
+
+    Counts, totals, minimums and maximums combine exactly; percentiles keep the error
+    bound of `KLLSketch`.
+
+    Parameters:
+        parts (Iterable[dict[str, SalaryStats]]): Results of `group_salary_stats`.
+
+    Returns:
+        dict[str, SalaryStats]: Aggregates by group name.
+    """
+    merged = {}
+    for part in parts:
+        for group, stats in part.items():
+            if group not in merged:
+                merged[group] = SalaryStats(KLLSketch(stats.sketch.k) if stats.sketch is not None else None)
+            merged[group].merge(stats)
+    return merged
 
 def total_salary(path: str) -> tuple[int, float]:
     """Calculate the total and average salary of developers from a file.
@@ -24,37 +427,39 @@ def total_salary(path: str) -> tuple[int, float]:
             If there is an issue with file content (e.g., malformed lines or no valid salary data).
     """
 
-    file_path = Path(path)
+    stats = salary_stats(path)
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"Input file does not exist: {file_path.name}.")
-
-    salaries = []
-
-    with file_path.open(mode='r', encoding='utf-8') as file:
-        for line in file:
-            try:
-                # Retrieve salary.
-                salary = int(line.strip().split(',')[1])
-                salaries.append(salary)
-            except (ValueError, IndexError):
-                raise ValueError(f"Malformed line: {line.strip()}")
-            
-    if not salaries:
+    if not stats.count:
         raise ValueError("No valid salary data found.")
 
-    total = sum(salaries)
-    return total, total / len(salaries)
+    return stats.total, stats.mean
     
 def main():
+    parser = argparse.ArgumentParser(description="Salary statistics of developers.")
     # Build the path and return it as string in POSIX format.
-    path = (Path(__file__).parent / 'content' / 'salaries.txt').as_posix()
+    parser.add_argument('path', nargs='?', default=(Path(__file__).parent / 'content' / 'salaries.txt').as_posix(),
+                        help="Comma-separated file with names and salaries.")
+    parser.add_argument('-g', '--group-by', type=int, metavar='COLUMN', help="Show statistics per value of the column (0-based).")
+    parser.add_argument('-p', '--percentiles', action='store_true', help="Show the 50th, 90th and 99th percentiles.")
+    args = parser.parse_args()
 
     try:
-        total, avg = total_salary(path)
-        print(f"Total salary: {total}, Average salary: {avg:.2f}")
+        if args.group_by is None and not args.percentiles:
+            total, avg = total_salary(args.path)
+            print(f"Total salary: {total}, Average salary: {avg:.2f}")
+            return
+
+        if args.group_by is None:
+            groups = {"All": salary_stats(args.path, quantiles=True)}
+        else:
+            groups = group_salary_stats(args.path, args.group_by, quantiles=args.percentiles)
+        for group, stats in sorted(groups.items()):
+            line = f"{group}: count {stats.count}, total {stats.total}, average {stats.mean:.2f}, min {stats.minimum}, max {stats.maximum}"
+            if args.percentiles and stats.count:
+                line += f", p50 {stats.percentile(50)}, p90 {stats.percentile(90)}, p99 {stats.percentile(99)}"
+            print(line)
     except Exception as e:
         print(f"Error occurred: {e}")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
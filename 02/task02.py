@@ -1,20 +1,174 @@
+import sys
+from bisect import bisect_left, bisect_right, insort
 from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+class Cat:
+    """Compact record of a cat: slots instead of a per-instance dictionary."""
+    __slots__ = ("id", "name", "age")
+
+    def __init__(self, id: str, name: str, age: int) -> None:
+        self.id = id
+        self.name = name
+        self.age = age
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Cat):
+            return NotImplemented
+        return (self.id, self.name, self.age) == (other.id, other.name, other.age)
+
+    def __repr__(self) -> str:
+        return f"Cat(id={self.id!r}, name={self.name!r}, age={self.age})"
+
+    def to_dict(self) -> dict:
+        """Convert to the dictionary returned by `get_cats_info`."""
+        return {"id": self.id, "name": self.name, "age": self.age}
+
+class Conflict(NamedTuple):
+    """Record with an already registered identifier but different data."""
+    line: int          # line number of the new record (starting from 1)
+    existing: Cat      # registered record
+    new: Cat           # rejected (or, with `replace`, registered) record
+
+class LoadReport(NamedTuple):
+    """Result of `CatRegistry.load`."""
+    added: int                 # amount of new records
+    duplicates: int            # amount of exact repetitions of registered records
+    conflicts: list[Conflict]  # records conflicting with registered ones
+
+class CatRegistry:
+    """Cats indexed by identifier, by name and by age.
+
+    The identifier index is a dictionary; the name and age indexes map a name or an age to
+    an (insertion-ordered) dictionary of identifier -> cat, so a cat is removed from them
+    in O(1), and the sorted list of ages lets an age range be found by binary search.
+    Names are interned: repeated names are stored once.
+    """
+
+    def __init__(self) -> None:
+        self._by_id: dict[str, Cat] = {}
+        self._by_name: dict[str, dict[str, Cat]] = {}
+        self._by_age: dict[int, dict[str, Cat]] = {}
+        self._ages: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Cat]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._by_id
+
+    def add(self, cat: Cat, replace: bool = False) -> Optional[Cat]:
+        """Register a cat, unless a cat with the same identifier is registered.
+
+        Parameters:
+            cat: Cat to register.
+            replace: Replace a registered cat with different data.
+
+        Returns:
+            The registered cat with the same identifier, None if there was no such cat.
+        """
+        existing = self._by_id.get(cat.id)
+        if existing is not None:
+            if replace and existing != cat:
+                self.remove(existing.id)
+                self._index(cat)
+            return existing
+        self._index(cat)
+        return None
+
+    def remove(self, id: str) -> Optional[Cat]:
+        """Remove a cat by identifier.
+
+        Returns:
+            The removed cat, None if there was no such cat.
+        """
+        cat = self._by_id.pop(id, None)
+        if cat is None:
+            return None
+        self._unlink(self._by_name, cat.name, cat)
+        if not self._unlink(self._by_age, cat.age, cat):
+            del self._ages[bisect_left(self._ages, cat.age)]
+        return cat
+
+    def get(self, id: str) -> Optional[Cat]:
+        """Find a cat by identifier."""
+        return self._by_id.get(id)
+
+    def find_by_name(self, name: str) -> list[Cat]:
+        """Find cats by name."""
+        return list(self._by_name.get(name, {}).values())
+
+    def find_by_age(self, min_age: int, max_age: int) -> list[Cat]:
+        """Find cats whose age is within the range (both ends included)."""
+        start = bisect_left(self._ages, min_age)
+        end = bisect_right(self._ages, max_age)
+        return [cat for age in self._ages[start:end] for cat in self._by_age[age].values()]
+
+    def load(self, path: str, replace: bool = False) -> LoadReport:
+        """Add the cats of a file, reading it line by line.
+
+        Exact repetitions of registered cats are skipped; cats with a registered identifier
+        but different data are reported as conflicts.
+
+        Parameters:
+            path: Path to the file with cats information.
+            replace: Register the conflicting cats instead of keeping the first ones.
+
+        Returns:
+            Counts of added and duplicate cats and the list of conflicts.
+
+        Raises:
+            FileNotFoundError:
+                If file cannot be found by input path.
+            ValueError:
+                If a line cannot be parsed correctly.
+        """
+        added = duplicates = 0
+        conflicts = []
+        for line_number, cat in enumerate(iter_cats(path), 1):
+            existing = self.add(cat, replace)
+            if existing is None:
+                added += 1
+            elif existing == cat:
+                duplicates += 1
+            else:
+                conflicts.append(Conflict(line_number, existing, cat))
+        return LoadReport(added, duplicates, conflicts)
+
+    def _index(self, cat: Cat) -> None:
+        self._by_id[cat.id] = cat
+        self._by_name.setdefault(cat.name, {})[cat.id] = cat
+        cats = self._by_age.get(cat.age)
+        if cats is None:
+            cats = self._by_age[cat.age] = {}
+            insort(self._ages, cat.age)
+        cats[cat.id] = cat
+
+    @staticmethod
+    def _unlink(index: dict, key, cat: Cat) -> bool:
+        """Remove the cat from an index bucket; returns False if the bucket got empty and was removed."""
+        cats = index[key]
+        del cats[cat.id]
+        if not cats:
+            del index[key]
+            return False
+        return True
+
+def iter_cats(path: str) -> Iterator[Cat]:
+    """Read cats from a file one by one.
 
-def get_cats_info(path:str) -> list[dict]:
-    """Parse file with information about cats. File contains ONLY unique cat's identifiers.
-    No duplication handling exists.
-    
     Parameters:
         path: Path to the file with cats information.
 
-    Returns:
-        List of dictionaries containing information about each cat.
+    Yields:
+        Cats in the order of the file lines.
 
     Raises:
         FileNotFoundError:
             If file cannot be found by input path.
-        PermissionError:
-            If there are insufficient permissions to read the file.
         ValueError:
             If a line cannot be parsed correctly.
     """
@@ -23,18 +177,36 @@ def get_cats_info(path:str) -> list[dict]:
 
     if not file_path.exists():
         raise FileNotFoundError(f"File cannot be found: {file_path.name}")
-    
-    cats_info = []
 
     with file_path.open('r', encoding='utf-8') as file:
-        try:
-            for line in file:
+        for line in file:
+            try:
                 guid, name, age = line.strip().split(',')
-                cats_info.append({"id": guid, "name": name, "age": int(age)})
-        except Exception:
-            raise ValueError(f"Malformed line: {line}")
-            
-    return cats_info
+                cat = Cat(guid, sys.intern(name), int(age))
+            except Exception:
+                raise ValueError(f"Malformed line: {line}")
+            yield cat
+
+def get_cats_info(path:str) -> list[dict]:
+    """Parse file with information about cats. File contains ONLY unique cat's identifiers.
+    No duplication handling exists; `CatRegistry.load` deduplicates the records.
+    
+    Parameters:
+        path: Path to the file with cats information.
+
+    Returns:
+        List of dictionaries containing information about each cat.
+
+    Raises:
+        FileNotFoundError:
+            If file cannot be found by input path.
+        PermissionError:
+            If there are insufficient permissions to read the file.
+        ValueError:
+            If a line cannot be parsed correctly.
+    """
+
+    return [cat.to_dict() for cat in iter_cats(path)]
 
 def main():
     path = (Path(__file__).parent / 'content' / 'cats_info.txt').as_posix()
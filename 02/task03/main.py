@@ -1,7 +1,330 @@
 import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TextIO
 from colorama import Fore
 
+# Maximum amount of directory listings requested ahead by the worker threads.
+PREFETCH_LIMIT = 256
+
+# Default location of the directory snapshots.
+SNAPSHOT_PATH = Path.home() / '.cache' / 'dir_info_snapshot.json'
+SNAPSHOT_VERSION = 2
+
+def list_dir(path: str) -> list[os.DirEntry]:
+    """
+    Lists a directory with `os.scandir`; the entries cache their type from the listing.
+
+    Args:
+        path (str): The directory path.
+
+    Returns:
+        list[os.DirEntry]: Entries of the directory in the order of the file system.
+    """
+    with os.scandir(path) as entries:
+        return list(entries)
+
+def compile_exclude(patterns: Iterable[str]) -> Optional[Callable[[str], object]]:
+    """
+    Combines glob patterns of names into one matching function, None if there are no patterns.
+    """
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns)).match
+
+class SnapshotEntry:
+    """
+    Directory entry restored from a snapshot, with the part of the `os.DirEntry` interface used here.
+
+    Only the type of the entry is kept; `stat` always asks the file system, because a file
+    changed in place does not change the modification time of its directory.
+    """
+    __slots__ = ("name", "path", "kind")
+
+    # Kinds of entries: a directory, a symbolic link to a directory, anything else.
+    DIR, DIR_LINK, OTHER = "d", "l", "f"
+
+    def __init__(self, parent: str, name: str, kind: str) -> None:
+        self.name = name
+        self.path = os.path.join(parent, name)
+        self.kind = kind
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return self.kind == self.DIR or (follow_symlinks and self.kind == self.DIR_LINK)
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        return os.stat(self.path, follow_symlinks=follow_symlinks)
+
+class Snapshot:
+    """
+    On-disk cache of directory listings keyed by directory path and modification time.
+
+    Adding, removing or renaming an entry changes the modification time of its directory,
+    so a directory with the recorded time is served from the snapshot with a single `stat`
+    instead of being listed again. Every directory is still checked: a change deep in the
+    tree does not touch the modification times of the directories above it. For the same
+    reason the snapshot keeps no file sizes: the aggregate mode reads them with a `stat` per file.
+
+    The listings of the walked directories replace the old ones on `save`, the listings
+    of directories removed since the previous snapshot are dropped.
+    """
+    def __init__(self, path: Path = SNAPSHOT_PATH) -> None:
+        """
+        Args:
+            path (Path): The snapshot file.
+        """
+        self.path = Path(path)
+        self.previous: dict[str, list] = {}   # directory path: [mtime_ns, [[name, kind], ...]]
+        self.listings: dict[str, tuple[int, list]] = {}   # walked directories: (mtime_ns, entries)
+        self.relisted: set[str] = set()                   # walked directories listed from the disk
+        try:
+            with self.path.open('r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get("version") == SNAPSHOT_VERSION:
+                self.previous = data["dirs"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def list(self, path: str) -> list:
+        """
+        Returns the listing of a directory, from the snapshot if the directory did not change.
+        """
+        mtime = os.stat(path).st_mtime_ns
+        record = self.previous.get(path)
+        if record is not None and record[0] == mtime:
+            entries = [SnapshotEntry(path, name, kind) for name, kind in record[1]]
+        else:
+            entries = list_dir(path)
+            self.relisted.add(path)
+        self.listings[path] = (mtime, entries)
+        return entries
+
+    def diff(self, excluded: Optional[Callable[[str], object]] = None) -> Iterator[tuple[str, str, bool]]:
+        """
+        Generator of the differences between the previous and the current listings of the walked directories.
+
+        Args:
+            excluded: Matching function of the names to leave out (see `compile_exclude`).
+
+        Yields:
+            tuple: '+' for an added or '-' for a removed entry, its path and whether it is a directory.
+        """
+        for path in sorted(self.relisted):
+            record = self.previous.get(path)
+            if record is None:
+                continue
+            old = {name: kind for name, kind in record[1]}
+            new = {entry.name: entry for entry in self.listings[path][1]}
+            changes = [(name, "-", kind != SnapshotEntry.OTHER) for name, kind in old.items() if name not in new]
+            changes += [(name, "+", entry.is_dir()) for name, entry in new.items() if name not in old]
+            for name, sign, is_dir in sorted(changes):
+                if excluded is None or not excluded(name):
+                    yield sign, os.path.join(path, name), is_dir
+
+    def save(self) -> None:
+        """
+        Writes the snapshot, replacing the file atomically.
+        """
+        removed = set()
+        for path in self.relisted:
+            record = self.previous.get(path)
+            if record is not None:
+                names = {entry.name for entry in self.listings[path][1]}
+                removed.update(os.path.join(path, name) for name, kind in record[1]
+                               if kind == SnapshotEntry.DIR and name not in names)
+
+        def is_removed(path: str) -> bool:
+            while True:
+                if path in removed:
+                    return True
+                parent = os.path.dirname(path)
+                if parent == path:
+                    return False
+                path = parent
+
+        dirs = {path: record for path, record in self.previous.items()
+                if path not in self.listings and not (removed and is_removed(path))}
+        for path, (mtime, entries) in self.listings.items():
+            dirs[path] = [mtime, [self._record(entry) for entry in entries]]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        with temporary.open('w', encoding='utf-8') as file:
+            json.dump({"version": SNAPSHOT_VERSION, "dirs": dirs}, file, separators=(',', ':'))
+        os.replace(temporary, self.path)
+
+    @staticmethod
+    def _record(entry) -> list:
+        if isinstance(entry, SnapshotEntry):
+            return [entry.name, entry.kind]
+        if entry.is_dir(follow_symlinks=False):
+            return [entry.name, SnapshotEntry.DIR]
+        if entry.is_dir():
+            return [entry.name, SnapshotEntry.DIR_LINK]
+        return [entry.name, SnapshotEntry.OTHER]
+
+class DirLister:
+    """
+    Lists directories, optionally reading the listings of subdirectories ahead in a thread pool.
+
+    The walker asks for the listings in its own (deterministic) order; the threads only
+    make the listings of the subdirectories it will visit soon ready in advance, which
+    hides the latency of slow (e.g. network) file systems.
+    """
+    def __init__(self, workers: int = 0, snapshot: Optional[Snapshot] = None) -> None:
+        """
+        Args:
+            workers (int): Number of threads listing directories ahead, 0 to list on demand only.
+            snapshot (Snapshot): Snapshot serving the listings of unchanged directories.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers) if workers else None
+        self.pending: dict[str, Future] = {}
+        self.list_dir = list_dir if snapshot is None else snapshot.list
+
+    def prefetch(self, paths: list[str]) -> None:
+        """
+        Starts listing the directories in the background.
+        """
+        if self.executor is None:
+            return
+        for path in paths:
+            if len(self.pending) >= PREFETCH_LIMIT:
+                break
+            if path not in self.pending:
+                self.pending[path] = self.executor.submit(self.list_dir, path)
+
+    def list(self, path: str) -> list[os.DirEntry]:
+        """
+        Returns the listing of a directory, waiting for it if it is being read in the background.
+        """
+        future = self.pending.pop(path, None)
+        if future is not None:
+            return future.result()
+        return self.list_dir(path)
+
+    def close(self) -> None:
+        if self.executor is not None:
+            for future in self.pending.values():
+                future.cancel()
+            self.executor.shutdown()
+            self.pending.clear()
+
+# Events yielded by `walk_events`.
+ENTRY = "entry"    # a directory entry
+MORE = "more"      # amount of entries of a directory left out by the entries limit
+LEAVE = "leave"    # all entries of a directory were walked; its entry (None for the root)
+
+class _Frame:
+    """
+    Directory being walked by `walk_events`.
+    """
+    __slots__ = ("entries", "level", "hidden", "left", "more", "directory")
+
+    def __init__(self, entries, level, hidden, left, more, directory) -> None:
+        self.entries = entries      # iterator over the listing
+        self.level = level          # depth level of the entries
+        self.hidden = hidden        # whether the directory itself is hidden
+        self.left = left            # amount of entries to show before the limit
+        self.more = more            # amount of entries over the limit
+        self.directory = directory  # entry of the directory, None for the root
+
+def walk_events(path: str, depth: int = 0, workers: int = 0, max_depth: Optional[int] = None,
+                max_entries: Optional[int] = None, exclude: Iterable[str] = (),
+                visit_hidden: bool = False, snapshot: Optional[Snapshot] = None) -> Iterator[tuple[str, object, int, bool]]:
+    """
+    Generator that walks a directory tree, parents before children, and yields walk events.
+
+    Uses an explicit stack instead of recursion, so the depth of the tree is not limited by
+    the recursion limit. Directory types come from the `os.scandir` listing, without extra
+    `stat` calls. Symbolic links to directories are yielded but not followed.
+
+    Entries deeper than `max_depth` or over `max_entries` of their directory are hidden:
+    their directories are not even listed, unless `visit_hidden` is set (to compute
+    aggregates of the whole tree). Entries matching an `exclude` pattern are skipped
+    with their subtrees in any case.
+
+    Args:
+        path (str): The directory path to walk through.
+        depth (int): The depth level of the directory entries, defaults to 0.
+        workers (int): Number of threads listing sibling subdirectories ahead, 0 to disable.
+        max_depth (int): The deepest level of shown entries, None for no limit.
+        max_entries (int): Maximum amount of shown entries per directory, None for no limit.
+        exclude (Iterable[str]): Glob patterns of the names of skipped entries.
+        visit_hidden (bool): Walk the hidden subtrees too and yield their events as hidden.
+        snapshot (Snapshot): Snapshot serving the listings of unchanged directories.
+
+    Yields:
+        tuple: Event (`ENTRY`, `MORE` or `LEAVE`), its value (`os.DirEntry`, amount of
+        entries over the limit, or the entry of the left directory), the depth level of
+        the directory entries and whether the event is hidden.
+    """
+    excluded = compile_exclude(exclude)
+    lister = DirLister(workers, snapshot)
+
+    def open_dir(dir_path: str, directory: Optional[os.DirEntry], level: int, hidden: bool) -> _Frame:
+        listing = lister.list(dir_path)
+        if excluded is not None:
+            listing = [entry for entry in listing if not excluded(entry.name)]
+        shown = len(listing) if max_entries is None else min(len(listing), max_entries)
+
+        # Read ahead the subdirectories which will be walked.
+        if visit_hidden:
+            descended = listing
+        elif hidden or (max_depth is not None and level >= max_depth):
+            descended = []
+        else:
+            descended = listing[:shown]
+        lister.prefetch([entry.path for entry in descended if entry.is_dir(follow_symlinks=False)])
+        return _Frame(iter(listing), level, hidden, shown, len(listing) - shown, directory)
+
+    try:
+        stack = [open_dir(path, None, depth, False)]
+        while stack:
+            frame = stack[-1]
+            if frame.left == 0 and frame.more:
+                yield MORE, frame.more, frame.level, frame.hidden
+                frame.more = 0
+                if not visit_hidden:
+                    frame.entries = iter(())
+
+            entry = next(frame.entries, None)
+            if entry is None:
+                stack.pop()
+                yield LEAVE, frame.directory, frame.level, frame.hidden
+                continue
+
+            hidden = frame.hidden or frame.left == 0
+            if frame.left:
+                frame.left -= 1
+            yield ENTRY, entry, frame.level, hidden
+
+            if entry.is_dir(follow_symlinks=False):
+                children_hidden = hidden or (max_depth is not None and frame.level >= max_depth)
+                if visit_hidden or not children_hidden:
+                    stack.append(open_dir(entry.path, entry, frame.level + 1, children_hidden))
+    finally:
+        lister.close()
+
+def walk_tree(path: str, depth: int = 0, workers: int = 0, max_depth: Optional[int] = None,
+              max_entries: Optional[int] = None, exclude: Iterable[str] = ()) -> Iterator[tuple[os.DirEntry, int]]:
+    """
+    Generator that yields directory entries with their depth level, parents before children.
+
+    See `walk_events` for the traversal and the arguments.
+
+    Yields:
+        tuple: A tuple containing the `os.DirEntry` and its depth level.
+    """
+    for event, value, level, _ in walk_events(path, depth, workers, max_depth, max_entries, exclude):
+        if event == ENTRY:
+            yield value, level
+
 def walk_dir(path:Path, depth:int = 0):
     """
     Generator that yields directory contents with their depth level.
@@ -13,17 +336,128 @@ def walk_dir(path:Path, depth:int = 0):
     Yields:
         tuple: A tuple containing the item (directory/file) and its depth level.
     """
-    for item in path.iterdir():
-        yield item, depth
-        if item.is_dir():
-            yield from walk_dir(item, depth + 1)
+    for entry, level in walk_tree(str(path), depth):
+        yield Path(entry.path), level
+
+def format_size(size: int) -> str:
+    """
+    Formats a size in bytes with a binary unit, e.g. '1.5 MiB'.
+    """
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if size < 1024 or unit == "TiB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+class TreeRenderer:
+    """
+    Renders walk events as colored tree lines, written in blocks instead of one `print` per entry.
+
+    In the aggregate mode every directory line shows the recursive amount of files and their
+    size. Such a line is known only when the directory is left, so the lines after the first
+    unfinished directory wait in the buffer until it is done.
+    """
+    def __init__(self, stream: TextIO = None, aggregate: bool = False, block_lines: int = 1000) -> None:
+        """
+        Args:
+            stream (TextIO): Output stream, defaults to `sys.stdout`.
+            aggregate (bool): Show recursive file counts and sizes of the directories.
+            block_lines (int): Amount of buffered lines written at once.
+        """
+        self.stream = stream or sys.stdout
+        self.aggregate = aggregate
+        self.block_lines = block_lines
+        self.lines: list[Optional[str]] = []   # None marks an unfinished directory line
+        self.written = 0                       # amount of lines written before `lines[0]`
+        # Aggregates of the open directories: [line number or None if hidden, line without totals, files, bytes].
+        self.open_dirs: list[list] = [[None, None, 0, 0]]
+        self.files = 0
+        self.size = 0
+
+    def add_line(self, line: str) -> None:
+        """
+        Adds a line (with its line break) to the output.
+        """
+        self.lines.append(line)
+        if len(self.lines) >= self.block_lines:
+            self.flush()
+
+    def handle(self, event: str, value, depth: int, hidden: bool) -> None:
+        """
+        Renders a `walk_events` event.
+        """
+        indent = '  ' * depth
+        if event == ENTRY:
+            if self.aggregate and value.is_dir(follow_symlinks=False):
+                line = f"{Fore.BLUE} {indent}{value.name}/"
+                self.open_dirs.append([None if hidden else self.written + len(self.lines), line, 0, 0])
+                if not hidden:
+                    self.add_line(None)
+                return
+            if self.aggregate:
+                try:
+                    size = value.stat(follow_symlinks=False).st_size
+                except OSError:
+                    size = 0
+                self.open_dirs[-1][2] += 1
+                self.open_dirs[-1][3] += size
+            if not hidden:
+                if value.is_dir():
+                    self.add_line(f"{Fore.BLUE} {indent}{value.name}/\n")
+                else:
+                    self.add_line(f"{Fore.GREEN} {indent}{value.name}\n")
+        elif event == MORE:
+            if not hidden:
+                self.add_line(f"{Fore.WHITE} {indent}... {value} more\n")
+        elif event == LEAVE and self.aggregate:
+            line_number, line, files, size = self.open_dirs.pop()
+            if self.open_dirs:
+                self.open_dirs[-1][2] += files
+                self.open_dirs[-1][3] += size
+            else:
+                self.files, self.size = files, size
+            if line_number is not None:
+                self.lines[line_number - self.written] = f"{line} ({files} files, {format_size(size)})\n"
+                self.flush(partial=True)
+
+    def flush(self, partial: bool = False) -> None:
+        """
+        Writes the buffered lines up to the first unfinished directory line.
+
+        Args:
+            partial (bool): Write only if a whole block is ready.
+        """
+        pending = next((line_number for line_number, *_ in self.open_dirs if line_number is not None), None)
+        end = len(self.lines) if pending is None else pending - self.written
+        if end and (not partial or end >= self.block_lines):
+            self.stream.write("".join(self.lines[:end]))
+            del self.lines[:end]
+            self.written += end
 
-def print_dir_info(path:str) -> None:
+    def close(self) -> None:
+        """
+        Writes all the buffered lines; unfinished directories are shown without totals.
+        """
+        for line_number, line, _, _ in self.open_dirs:
+            if line_number is not None:
+                self.lines[line_number - self.written] = line + "\n"
+        self.open_dirs = [[None, None, 0, 0]]
+        self.flush()
+        self.stream.flush()
+
+def print_dir_info(path:str, workers:int = 0, max_depth:Optional[int] = None, max_entries:Optional[int] = None,
+                   exclude:Iterable[str] = (), aggregate:bool = False, snapshot:Optional[Snapshot] = None) -> None:
     """
     Prints the directory structure starting from the given path.
 
     Args:
         path (str): The root directory path to start printing from.
+        workers (int): Number of threads listing directories ahead, 0 to disable.
+        max_depth (int): The deepest level of printed entries (1 - the root contents), None for no limit.
+        max_entries (int): Maximum amount of printed entries per directory, None for no limit.
+        exclude (Iterable[str]): Glob patterns of the names of skipped entries (with their contents).
+        aggregate (bool): Print recursive file counts and sizes of the directories. The whole
+            tree is walked then, the limits only shorten the output.
+        snapshot (Snapshot): Snapshot serving the listings of unchanged directories, saved after the walk.
 
     Raises:
         FileNotFoundError:
@@ -31,18 +465,56 @@ def print_dir_info(path:str) -> None:
         PermissionError: 
             If the permissions do not allow reading the directory.
     """
+    renderer = TreeRenderer(aggregate=aggregate)
     try:
         dir_path = Path(path).resolve(strict=True)
 
         # Print root directory.
-        print(f"{Fore.BLUE} {dir_path.stem}/")
+        renderer.add_line(f"{Fore.BLUE} {dir_path.stem}/\n")
 
-        for item, depth in walk_dir(dir_path, 1):
-            indent = '  ' * depth
-            if item.is_dir():
-                print(f"{Fore.BLUE} {indent}{item.name}/")
-            else:
-                print(f"{Fore.GREEN} {indent}{item.name}")
+        for event in walk_events(str(dir_path), 1, workers, max_depth, max_entries, exclude, aggregate, snapshot):
+            renderer.handle(*event)
+        renderer.close()
+        if snapshot is not None:
+            snapshot.save()
+
+        if aggregate:
+            print(f"{Fore.BLUE} Total: {renderer.files} files, {format_size(renderer.size)}")
+    except FileNotFoundError as fnf_error:
+        renderer.close()
+        print(f"Error: Directory not found - {fnf_error}")
+    except PermissionError as perm_error:
+        renderer.close()
+        print(f"Error: Permission denied - {perm_error}")
+    except Exception as e:
+        renderer.close()
+        print(f"An unexpected error occurred: {e}")
+
+def print_dir_diff(path:str, snapshot:Snapshot, workers:int = 0, exclude:Iterable[str] = ()) -> None:
+    """
+    Prints the entries added or removed since the previous snapshot of the directory tree and saves the new snapshot.
+
+    Args:
+        path (str): The root directory path.
+        snapshot (Snapshot): Snapshot with the previous listings.
+        workers (int): Number of threads listing directories ahead, 0 to disable.
+        exclude (Iterable[str]): Glob patterns of the names of skipped entries (with their contents).
+    """
+    try:
+        dir_path = Path(path).resolve(strict=True)
+        root = str(dir_path)
+        if root not in snapshot.previous:
+            print(f"No previous snapshot of {root}, recording it.")
+        for _ in walk_events(root, 1, workers, exclude=exclude, snapshot=snapshot):
+            pass
+
+        lines = []
+        for sign, entry_path, is_dir in snapshot.diff(compile_exclude(exclude)):
+            color = Fore.GREEN if sign == "+" else Fore.RED
+            lines.append(f"{color} {sign} {os.path.relpath(entry_path, root)}{'/' if is_dir else ''}\n")
+        sys.stdout.write("".join(lines))
+        print(f"{Fore.BLUE} {len(lines)} changes, {len(snapshot.relisted)} of {len(snapshot.listings)} directories changed")
+        snapshot.save()
     except FileNotFoundError as fnf_error:
         print(f"Error: Directory not found - {fnf_error}")
     except PermissionError as perm_error:
@@ -53,11 +525,24 @@ def print_dir_info(path:str) -> None:
 def main():
     parser = argparse.ArgumentParser(description="Utility for printing directory structure.")
     parser.add_argument('-p', '--path', type=str, help='Path to the directory which structure will be printed.')
+    parser.add_argument('-j', '--workers', type=int, default=0, help='Number of threads listing subdirectories ahead (useful on network file systems).')
+    parser.add_argument('-d', '--max-depth', type=int, help='Print entries down to this depth only (1 - the directory contents).')
+    parser.add_argument('-n', '--max-entries', type=int, help='Print at most this amount of entries per directory.')
+    parser.add_argument('-e', '--exclude', action='append', default=[], metavar='GLOB', help='Skip entries whose name matches the glob pattern (can be repeated).')
+    parser.add_argument('-a', '--aggregate', action='store_true', help='Print the recursive amount of files and their size for every directory.')
+    parser.add_argument('-c', '--cache', nargs='?', const=SNAPSHOT_PATH, metavar='FILE', help=f'Reuse the listings of unchanged directories from a snapshot file (default {SNAPSHOT_PATH}).')
+    parser.add_argument('--diff', action='store_true', help='Print the entries added or removed since the last snapshot instead of the tree.')
 
     args = parser.parse_args()
 
-    if args.path:
-        print_dir_info(args.path)
+    snapshot = None
+    if args.cache or args.diff:
+        snapshot = Snapshot(args.cache or SNAPSHOT_PATH)
+
+    if args.path and args.diff:
+        print_dir_diff(args.path, snapshot, args.workers, args.exclude)
+    elif args.path:
+        print_dir_info(args.path, args.workers, args.max_depth, args.max_entries, args.exclude, args.aggregate, snapshot)
     else:
         print("Invalid input argument.")
         
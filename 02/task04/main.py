@@ -1,3 +1,13 @@
+import argparse
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import TextIO
+
+# Set while commands are executed by `run_batch`.
+batch_mode = False
+
 def hello() -> str:
     """
     Returns a greeting message.
@@ -22,8 +32,7 @@ def add_contact(args: list, contacts: dict) -> str:
         name, phone = args
 
         if name in contacts:
-            response = input("Would you like to update the existing contact? [yes/no]: ").strip().lower()
-            if response == 'yes':
+            if confirm("Would you like to update the existing contact?"):
                 return change_contact(args, contacts)
 
         contacts[name] = phone
@@ -51,8 +60,7 @@ def change_contact(args: list, contacts: dict) -> str:
         name, phone = args
 
         if name not in contacts:
-            response = input(f"Contact [{name}] does not exist. Would you like to create a new one? [yes/no]: ").strip().lower()
-            if response == 'yes':
+            if confirm(f"Contact [{name}] does not exist. Would you like to create a new one?"):
                 return add_contact(args, contacts) 
         
         contacts[name] = phone
@@ -115,11 +123,112 @@ def parse_input(user_input: str) -> tuple:
     cmd = cmd.strip().lower()
     return cmd, *args
 
+def confirm(question: str) -> bool:
+    """
+    Asks the user a yes/no question. In batch mode nothing is asked and the answer is 'no'.
+
+    Args:
+        question (str): The question to ask.
+
+    Returns:
+        bool: True if the user answered 'yes'.
+    """
+    if batch_mode:
+        return False
+    return input(f"{question} [yes/no]: ").strip().lower() == 'yes'
+
+def execute(command: str, args: list, contacts: dict) -> str:
+    """
+    Executes a single command.
+
+    Args:
+        command (str): The command name.
+        args (list): The command arguments.
+        contacts (dict): Dictionary containing all contacts.
+
+    Returns:
+        str: Output of the command, None if the command printed its output itself.
+    """
+    if command == 'hello':
+        return hello()
+    elif command == 'add':
+        return add_contact(args, contacts)
+    elif command == 'change':
+        return change_contact(args, contacts)
+    elif command == 'phone':
+        return show_phone(*args, contacts)
+    elif command == 'all':
+        show_all(contacts)
+        return None
+    else:
+        return "Invalid command."
+
+def run_batch(stream: TextIO, contacts: dict, flush_every: int = 10000) -> None:
+    """
+    Executes commands read from a stream without prompting the user.
+
+    Output is buffered and written in blocks of `flush_every` commands. Throughput
+    is reported to stderr when the stream ends or 'close'/'exit' is read.
+
+    Args:
+        stream (TextIO): Stream with one command per line.
+        contacts (dict): Dictionary containing all contacts.
+        flush_every (int): Number of commands between two writes of the output buffer.
+    """
+    global batch_mode
+    batch_mode = True
+    stdout = sys.stdout
+    buffer = io.StringIO()
+    count = 0
+    start = time.perf_counter()
+
+    try:
+        with redirect_stdout(buffer):
+            for line in stream:
+                line = line.strip().lower()
+                if not line:
+                    continue
+                command, *args = parse_input(line)
+                if command in ['close', 'exit']:
+                    break
+                try:
+                    output = execute(command, args, contacts)
+                    if output is not None:
+                        print(output)
+                except Exception as ex:
+                    print(f"Unexpected error: {str(ex)}")
+
+                count += 1
+                if count % flush_every == 0:
+                    stdout.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+    finally:
+        batch_mode = False
+        stdout.write(buffer.getvalue())
+        stdout.flush()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else float('inf')
+    print(f"Processed {count} commands in {elapsed:.3f}s ({rate:.0f} commands/s).", file=sys.stderr)
+
 def main() -> None:
-    print("Welcome to the assistance bot!")
+    arg_parser = argparse.ArgumentParser(description="Assistant bot for managing contacts.")
+    arg_parser.add_argument('-b', '--batch', type=str, help="Execute commands from the file ('-' for stdin) and exit.")
+    cli_args = arg_parser.parse_args()
 
     contacts = {}
 
+    if cli_args.batch:
+        if cli_args.batch == '-':
+            run_batch(sys.stdin, contacts)
+        else:
+            with open(cli_args.batch, 'r', encoding='utf-8') as f:
+                run_batch(f, contacts)
+        return
+
+    print("Welcome to the assistance bot!")
+
     while True:
         try:
             user_input = input('"Enter a command: ').strip().lower()
@@ -128,18 +237,10 @@ def main() -> None:
             if command in ['close', 'exit']:
                 print(close())
                 break
-            elif command == 'hello':
-                print(hello())
-            elif command == 'add':
-                print(add_contact(args, contacts))
-            elif command == 'change':
-                print(change_contact(args, contacts))
-            elif command == 'phone':
-                print(show_phone(*args, contacts))
-            elif command == 'all':
-                show_all(contacts)
-            else:
-                print("Invalid command.")
+
+            output = execute(command, args, contacts)
+            if output is not None:
+                print(output)
         except Exception as ex:
             print(f"Unexpected error: {str(ex)}")
 
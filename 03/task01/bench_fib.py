@@ -0,0 +1,82 @@
+import argparse
+import random
+import time
+import fib_v1
+import fib_v2
+import fib_fast
+
+def recursive_caching_fibonacci():
+    """The original `fib_v1.caching_fibonacci`: recursion with an unbounded dictionary cache."""
+    cache = dict()
+
+    def fibonacci(n: int) -> int:
+        if n <= 0:
+            return 0
+        if n == 1:
+            return 1
+        if n in cache:
+            return cache[n]
+        cache[n] = fibonacci(n - 1) + fibonacci(n - 2)
+        return cache[n]
+
+    return fibonacci
+
+def measure(compute, n: int) -> str:
+    """Times one call, reporting a RecursionError instead of a time."""
+    start = time.perf_counter()
+    try:
+        compute(n)
+    except RecursionError:
+        return "RecursionError"
+    return f"{time.perf_counter() - start:.6f}s"
+
+def recursive(n: int) -> int:
+    # New memoized function per call, the cache isn't reused between the measurements.
+    return recursive_caching_fibonacci()(n)
+
+def checkpointed(n: int) -> int:
+    return fib_v1.caching_fibonacci()(n)
+
+def v2(n: int) -> int:
+    fib_v2.fibonacci.cache_clear()
+    return fib_v2.fibonacci(n)
+
+def repeated_queries(queries: list[int], maxsize: int, checkpoint: int) -> None:
+    """Times a stream of repeated queries through `fib_v1.caching_fibonacci` and prints its cache statistics."""
+    fib = fib_v1.caching_fibonacci(maxsize, checkpoint)
+    start = time.perf_counter()
+    for n in queries:
+        fib(n)
+    elapsed = time.perf_counter() - start
+    print(f"{str(maxsize):>8} {checkpoint:>10} {elapsed:>10.3f}s  {fib.cache_info()}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the recursive memoized Fibonacci functions, fast doubling "
+                                                 "and the bounded checkpoint cache of fib_v1.")
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=[10, 100, 500, 1000, 10_000, 100_000, 1_000_000],
+                        help="Positions in the Fibonacci sequence to compute.")
+    parser.add_argument('-m', '--modulus', type=int, default=10 ** 9 + 7, help="Modulus for fib_mod.")
+    parser.add_argument('-q', '--queries', type=int, default=20_000, help="Amount of repeated queries for the cache settings.")
+    parser.add_argument('--max-n', type=int, default=20_000, help="Largest position of the repeated queries.")
+    args = parser.parse_args()
+
+    print(f"{'n':>10} {'recursive v1':>16} {'fib_v2':>16} {'fib_v1':>16} {'fib_fast':>16} {'fib_mod':>16}")
+    for n in args.sizes:
+        expected = fib_fast.fibonacci(n)
+        assert fib_fast.fib_mod(n, args.modulus) == expected % args.modulus
+        print(f"{n:>10} {measure(recursive, n):>16} {measure(v2, n):>16} {measure(checkpointed, n):>16} "
+              f"{measure(fib_fast.fibonacci, n):>16} {measure(lambda n: fib_fast.fib_mod(n, args.modulus), n):>16}")
+
+    n = 10 ** 18
+    print(f"fib_mod(10**18, {args.modulus}) = {fib_fast.fib_mod(n, args.modulus)} in {measure(lambda n: fib_fast.fib_mod(n, args.modulus), n)}")
+
+    # Skewed repeated queries: a few hot positions and a long tail.
+    hot = [random.randint(1, args.max_n) for _ in range(100)]
+    queries = [random.choice(hot) if random.random() < 0.8 else random.randint(1, args.max_n) for _ in range(args.queries)]
+    print(f"\n{args.queries} repeated queries up to n = {args.max_n}")
+    print(f"{'maxsize':>8} {'checkpoint':>10} {'time':>11}  cache statistics")
+    for maxsize, checkpoint in [(None, 1), (1000, 1), (100, 1), (None, 64), (100, 64), (10, 256)]:
+        repeated_queries(queries, maxsize, checkpoint)
+
+if __name__ == '__main__':
+    main()
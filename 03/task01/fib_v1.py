@@ -1,17 +1,49 @@
-from typing import Callable
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+from fib_fast import fib_pair
 
-def caching_fibonacci() -> Callable[[int], int]:
+class CacheInfo(NamedTuple):
+    """Statistics of the cache of `caching_fibonacci`."""
+    hits: int                # calls served from a cached checkpoint
+    misses: int              # calls which had to compute their checkpoint
+    evictions: int           # checkpoints removed to respect the capacity
+    maxsize: Optional[int]   # capacity in checkpoints, None for no limit
+    currsize: int            # amount of cached checkpoints
+
+def caching_fibonacci(maxsize: Optional[int] = None, checkpoint: int = 1) -> Callable[[int], int]:
     """
     Returns a Fibonacci function with memoization to optimize repeated calculations.
 
+    Only every `checkpoint`-th position is cached, as the pair F(k), F(k + 1); the values
+    between two checkpoints are computed by at most `checkpoint - 1` additions from the
+    lower one. With `maxsize` the least recently used checkpoints are evicted, so memory
+    stays bounded in a long-running process. A missing checkpoint is computed from the
+    previous checkpoint if it is cached, otherwise by fast doubling, without recursion.
+
+    The returned function has `cache_info()` with the hit, miss and eviction counters
+    and `cache_clear()`.
+
+    Args:
+        maxsize (Optional[int]): Maximum amount of cached checkpoints, None for no limit.
+        checkpoint (int): Distance between the cached positions.
+
     Returns:
         Callable[[int], int]: A function that computes the nth Fibonacci number.
+
+    Raises:
+        ValueError: If `maxsize` is negative or `checkpoint` is not positive.
     """
-    cache = dict()
+    if maxsize is not None and maxsize < 0:
+        raise ValueError(f"Cache size must not be negative: {maxsize}")
+    if checkpoint < 1:
+        raise ValueError(f"Checkpoint distance must be positive: {checkpoint}")
+
+    cache: OrderedDict[int, tuple[int, int]] = OrderedDict()
+    hits = misses = evictions = 0
 
     def fibonacci(n : int) -> int:
         """
-        Computes the nth Fibonacci number using recursion and memoization.
+        Computes the nth Fibonacci number from the nearest cached checkpoint below it.
 
         Args:
             n (int): The position in the Fibonacci sequence to compute.
@@ -19,19 +51,51 @@ def caching_fibonacci() -> Callable[[int], int]:
         Returns:
             int: The nth Fibonacci number.
         """
-        nonlocal cache
+        nonlocal hits, misses, evictions
 
         if n <= 0:
             return 0
         if n == 1: 
             return 1
-        if n in cache:
-            return cache[n]
 
-        # Calculate and cache the nth Fibonacci number
-        cache[n] = fibonacci(n - 1) + fibonacci(n - 2)
-        return cache[n]
-    
+        base = n - n % checkpoint
+        pair = cache.get(base)
+        if pair is not None:
+            hits += 1
+            cache.move_to_end(base)
+        else:
+            misses += 1
+            previous = cache.get(base - checkpoint)
+            if previous is not None:
+                a, b = previous
+                for _ in range(checkpoint):
+                    a, b = b, a + b
+                pair = (a, b)
+            else:
+                pair = fib_pair(base)
+
+            # Cache the checkpoint, evicting the least recently used one if the cache is full
+            if maxsize != 0:
+                cache[base] = pair
+                if maxsize is not None and len(cache) > maxsize:
+                    cache.popitem(last=False)
+                    evictions += 1
+
+        a, b = pair
+        for _ in range(n - base):
+            a, b = b, a + b
+        return a
+
+    def cache_info() -> CacheInfo:
+        return CacheInfo(hits, misses, evictions, maxsize, len(cache))
+
+    def cache_clear() -> None:
+        nonlocal hits, misses, evictions
+        cache.clear()
+        hits = misses = evictions = 0
+
+    fibonacci.cache_info = cache_info
+    fibonacci.cache_clear = cache_clear
     return fibonacci
 
 if __name__ == '__main__':
@@ -40,4 +104,4 @@ if __name__ == '__main__':
     # print(fib(10))
     # print(fib(15))
 
-    print([fib(n) for n in range(16)])
\ No newline at end of file
+    print([fib(n) for n in range(16)])
@@ -1,6 +1,12 @@
 from functools import lru_cache
 
-@lru_cache(maxsize=None)
+# Capacity of the cache: the recursion needs only the two latest values, so a bounded
+# cache computes each value once per call while keeping memory constant.
+# `fibonacci.cache_info()` reports hits, misses and the current size; evictions are
+# `misses - currsize` (since the last `cache_clear()`).
+CACHE_SIZE = 1024
+
+@lru_cache(maxsize=CACHE_SIZE)
 def fibonacci(n : int) -> int:
     """
     Computes the nth Fibonacci number using recursion and memoization.
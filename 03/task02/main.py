@@ -1,7 +1,14 @@
 import argparse
+import glob
+import math
+import mmap
 import os
 import re
-from typing import Callable, Generator
+import signal
+import sys
+from functools import partial
+from multiprocessing import Pool
+from typing import Callable, Dict, Generator, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 input_dir = "revenues/"
 
@@ -18,33 +25,225 @@ def generator_numbers(text: str) -> Generator[float, None, None]:
     for match in re.finditer(r"(?<![\w.])[+-]?(\d+(\.\d*)?|\.\d+)(?![\w.])", text):
         yield float(match.group())
 
-def sum_profit(text: str, func: Callable[[str], Generator[float, None, None]]) -> float:
+# Bytes version of the `generator_numbers` pattern; neighbours outside ASCII are checked separately.
+# It starts with a plain character class, so the regex engine can skip to the candidates quickly:
+# the first character is a sign, a digit or a dot that doesn't follow a word character or a dot.
+NUMBER_BYTES_REGEX = re.compile(rb"[+\-\d.](?<![\w.][+\-\d.])"
+                                rb"(?:(?<=[+-])(?:\d+(?:\.\d*)?|\.\d+)|(?<=\d)\d*(?:\.\d*)?|(?<=\.)\d+)(?![\w.])")
+
+def generator_numbers_bytes(data: Union[bytes, mmap.mmap]) -> Generator[float, None, None]:
+    """
+    Parse UTF-8 encoded data (bytes or a memory-mapped file) without decoding it as a whole.
+
+    Finds the same numbers as `generator_numbers` written with ASCII digits: a number
+    next to a non-ASCII letter (e.g. '100грн') is skipped like in the text version.
+
+    Args:
+        data (Union[bytes, mmap.mmap]): UTF-8 encoded input containing revenue data.
+
+    Yields:
+        float: Parsed revenue numbers.
+    """
+    size = len(data)
+    for match in NUMBER_BYTES_REGEX.finditer(data):
+        start, end = match.span()
+        if end < size and data[end] >= 0x80 and _is_word_char(_char_at(data, end)):
+            continue
+        number = match.group()
+        if start > 0 and data[start - 1] >= 0x80 and _is_word_char(_char_before(data, start)):
+            if number[:1] not in (b"+", b"-"):
+                continue
+            # Like the text version, take the number without its sign: it follows the sign, not a letter.
+            number = number[1:]
+        yield float(number)
+
+def _char_before(data: Union[bytes, mmap.mmap], end: int) -> str:
+    start = end - 1
+    # Step back over UTF-8 continuation bytes to the first byte of the character.
+    while start > max(0, end - 4) and 0x80 <= data[start] < 0xC0:
+        start -= 1
+    return data[start:end].decode('utf-8', errors='replace')
+
+def _char_at(data: Union[bytes, mmap.mmap], start: int) -> str:
+    lead = data[start]
+    size = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return data[start:start + size].decode('utf-8', errors='replace')[:1]
+
+def _is_word_char(char: str) -> bool:
+    return re.match(r"\w", char) is not None
+
+def sum_profit(text: str, func: Callable[[str], Iterable[float]]) -> float:
     """
     Calculates total profit based on revenue data parsed from the input text.
 
+    The numbers are consumed one by one and summed with `math.fsum`, which keeps the
+    rounding error of the total within one ulp however many numbers there are.
+
     Args:
         text (str): Input text containing revenue data.
-        func (Callable[[str], Generator[float, None, None]]): Generator function to parse revenue data.
+        func (Callable[[str], Iterable[float]]): Generator function to parse revenue data.
 
     Returns:
         float: Total calculated profit.
     """
-    total_profit = sum(func(text))
+    total_profit = math.fsum(func(text))
     return total_profit
 
-if __name__ == '__main__':
+def file_income(path: str, use_mmap: bool = False) -> float:
+    """
+    Calculates total income from a revenue file.
+
+    Args:
+        path (str): Path to the file with revenue data.
+        use_mmap (bool): Memory-map the file and parse its bytes instead of reading it as text,
+            so memory usage doesn't grow with the file size.
+
+    Returns:
+        float: Total income.
+    """
+    if not use_mmap:
+        with open(path, 'r', encoding='utf-8') as f:
+            # Load full text and parse income data.
+            return sum_profit(f.read(), generator_numbers)
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be mapped.
+            return 0.0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return sum_profit(mm, generator_numbers_bytes)
+
+# Approximate amount of file bytes sent to a worker at once by `aggregate_income`.
+BATCH_BYTES = 64 * 1024 * 1024
+
+class IncomeReport(NamedTuple):
+    """
+    Result of `aggregate_income`.
+    """
+    totals: Dict[str, float]      # total income per processed file
+    errors: Dict[str, str]        # error message per file that couldn't be read
+    total: float                  # total income of all processed files
+    complete: bool                # False if the processing was interrupted
+
+def find_revenue_files(path: str) -> List[str]:
+    """
+    Expand a directory or a glob pattern into the revenue files it contains.
+
+    Args:
+        path (str): Directory, glob pattern or a single file.
+
+    Returns:
+        List[str]: Sorted paths of the files.
+    """
+    if os.path.isdir(path):
+        paths = [entry.path for entry in os.scandir(path) if entry.is_file()]
+    else:
+        paths = [match for match in glob.glob(path) if os.path.isfile(match)]
+    return sorted(paths)
+
+def files_income(paths: List[str], use_mmap: bool = False) -> List[Tuple[str, Optional[float], Optional[str]]]:
+    """
+    Calculates total income of every file of a batch (worker of `aggregate_income`).
+
+    Returns:
+        List[Tuple[str, Optional[float], Optional[str]]]: Path, total income and error message of every file.
+    """
+    results = []
+    for path in paths:
+        try:
+            results.append((path, file_income(path, use_mmap), None))
+        except (OSError, ValueError) as e:
+            results.append((path, None, str(e)))
+    return results
+
+def _ignore_interrupts() -> None:
+    # Ctrl+C is handled by the main process, which stops the workers.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def aggregate_income(paths: List[str], jobs: int = None, use_mmap: bool = False, progress: bool = True) -> IncomeReport:
+    """
+    Calculates total income of many revenue files in a pool of processes.
+
+    Files are sent to the workers in batches, so thousands of small files don't cost
+    thousands of round trips. On Ctrl+C the workers are stopped and the totals of the
+    files processed so far are returned.
+
+    Args:
+        paths (List[str]): Paths of the revenue files.
+        jobs (int): Number of worker processes, defaults to the number of CPUs.
+        use_mmap (bool): Memory-map the files instead of loading them (see `file_income`).
+        progress (bool): Show the amount of processed files on stderr.
+
+    Returns:
+        IncomeReport: Per-file totals, errors, grand total and whether all files were processed.
+    """
+    totals, errors = {}, {}
+    complete = True
+    workers = jobs or os.cpu_count() or 1
+
+    # Batches of up to 64 files and about 64 MB, so big files still give a steady progress.
+    batches, batch, batch_bytes = [], [], 0
+    for path in paths:
+        batch.append(path)
+        batch_bytes += os.path.getsize(path)
+        if len(batch) >= 64 or batch_bytes >= BATCH_BYTES:
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+    if batch:
+        batches.append(batch)
+
+    with Pool(workers, initializer=_ignore_interrupts) as pool:
+        try:
+            for results in pool.imap_unordered(partial(files_income, use_mmap=use_mmap), batches):
+                for path, total, error in results:
+                    if error is None:
+                        totals[path] = total
+                    else:
+                        errors[path] = error
+                if progress:
+                    print(f"\rProcessed {len(totals) + len(errors)}/{len(paths)} files", end="", file=sys.stderr, flush=True)
+        except KeyboardInterrupt:
+            # Leaving the `with` block terminates the workers, including the busy ones.
+            complete = False
+        finally:
+            if progress and paths:
+                print(file=sys.stderr)
+
+    return IncomeReport(totals, errors, math.fsum(totals.values()), complete)
+
+def main():
     parser = argparse.ArgumentParser(description="Utility for calculating the total income based on a data from file.")    
-    parser.add_argument('-f', '--file', type=str, help="Name of the input file with data about revenue.", required=True)
+    sources = parser.add_mutually_exclusive_group(required=True)
+    sources.add_argument('-f', '--file', type=str, help="Name of the input file with data about revenue.")
+    sources.add_argument('-p', '--path', type=str, help="Directory or glob pattern of revenue files to aggregate.")
+    parser.add_argument('-j', '--jobs', type=int, help="Number of processes used to aggregate the files of --path.")
+    parser.add_argument('-m', '--mmap', action='store_true', help="Memory-map the file instead of loading it, for very large files.")
 
     args = parser.parse_args()
 
+    if args.path:
+        paths = find_revenue_files(args.path)
+        if not paths:
+            print(f"Error: No files found: '{args.path}'.")
+            return
+
+        report = aggregate_income(paths, args.jobs, args.mmap)
+        for path in sorted(report.totals):
+            print(f"{path}: {report.totals[path]}")
+        for path in sorted(report.errors):
+            print(f"{path}: error: {report.errors[path]}")
+        if not report.complete:
+            print(f"Interrupted: {len(report.totals)} of {len(paths)} files processed.")
+        print(f"Total income: {report.total}")
+        return
+
     full_file_path = os.path.join(input_dir, args.file)
 
     if os.path.isfile(full_file_path):
-        with open(full_file_path, 'r', encoding='utf-8') as f:
-            # Load full text and parse income data.
-            text = f.read()
-            total_income = sum_profit(text, generator_numbers)
-            print(f"Total income: {total_income}")
+        total_income = file_income(full_file_path, args.mmap)
+        print(f"Total income: {total_income}")
     else:
-        print(f"Error: The file {args.file} does not exist in the directory '{input_dir}'.")
\ No newline at end of file
+        print(f"Error: The file {args.file} does not exist in the directory '{input_dir}'.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class ColumnarLogStore:
+    """
+    Column-oriented storage of parsed log messages: [<Date>, <Time>, <Level>, <Content>].
+
+    Levels are dictionary-encoded into one byte per row, dates and times are packed into
+    integers (YYYYMMDD and HHMMSS) and contents are kept in one UTF-8 buffer addressed by
+    offsets. For every level the store also keeps the list of its row numbers, so filtering
+    by level selects rows by index instead of testing every message. Time ranges are cut
+    by binary search over a sorted timestamp index, built on demand (with NumPy when it is
+    installed) and extended when new rows are appended.
+    """
+
+    def __init__(self) -> None:
+        self.levels: List[str] = []
+        self.level_codes: Dict[str, int] = {}
+        self.level_column = array('B')
+        self.date_column = array('I')
+        self.time_column = array('I')
+        self.content_buffer = bytearray()
+        self.content_offsets = array('Q', [0])
+        self.rows_by_level: Dict[int, array] = {}
+        # Timestamp index: sorted packed timestamps and the matching rows, or None
+        # while the rows are already in timestamp order.
+        self._stamps = array('Q')
+        self._order = None
+
+    def __len__(self) -> int:
+        return len(self.level_column)
+
+    def append(self, message: List[str]) -> None:
+        """
+        Append a parsed message.
+
+        Args:
+            message (List[str]): Date ('YYYY-MM-DD'), time ('HH:MM:SS'), level and content.
+        """
+        date, time, level, content = message
+
+        code = self.level_codes.get(level)
+        if code is None:
+            code = self.level_codes[level] = len(self.levels)
+            self.levels.append(level)
+            self.rows_by_level[code] = array('I')
+
+        self.rows_by_level[code].append(len(self.level_column))
+        self.level_column.append(code)
+        self.date_column.append(int(date.replace('-', '')))
+        self.time_column.append(int(time.replace(':', '')))
+        self.content_buffer += content.encode('utf-8')
+        self.content_offsets.append(len(self.content_buffer))
+
+    def row(self, index: int) -> Tuple[str, str, str, str]:
+        """
+        Decode a stored message.
+
+        Args:
+            index (int): Row number.
+
+        Returns:
+            Tuple[str, str, str, str]: Date, time, level and content of the message.
+        """
+        return (format_date(self.date_column[index]), format_time(self.time_column[index]),
+                self.levels[self.level_column[index]], self.content(index))
+
+    def content(self, index: int) -> str:
+        """
+        Decode the content of a stored message.
+        """
+        return self.content_buffer[self.content_offsets[index]:self.content_offsets[index + 1]].decode('utf-8')
+
+    def count_by_level(self) -> Dict[str, int]:
+        """
+        Count the stored messages by level.
+        """
+        return {self.levels[code]: len(rows) for code, rows in self.rows_by_level.items()}
+
+    def select_level(self, log_lvl: str) -> List[int]:
+        """
+        Select the rows of a log level (case-insensitive).
+
+        Args:
+            log_lvl (str): Log level to select.
+
+        Returns:
+            List[int]: Sorted row numbers.
+        """
+        codes = [code for level, code in self.level_codes.items() if level.lower() == log_lvl.lower()]
+        if len(codes) == 1:
+            return self.rows_by_level[codes[0]].tolist()
+        return sorted(row for code in codes for row in self.rows_by_level[code])
+
+    def select_time_range(self, since: str, until: str) -> List[int]:
+        """
+        Select the rows logged within a time range (both ends included).
+
+        Args:
+            since (str): Start of the range, 'YYYY-MM-DD HH:MM:SS'.
+            until (str): End of the range, 'YYYY-MM-DD HH:MM:SS'.
+
+        Returns:
+            List[int]: Sorted row numbers.
+        """
+        start, end = self._cut(pack_timestamp(since), pack_timestamp(until))
+        return self._slice_rows(start, end)
+
+    def query(self, log_lvl: str = None, since: str = None, until: str = None,
+              contains: str = None, pattern: str = None) -> List[int]:
+        """
+        Select the rows matching all the given predicates.
+
+        Bounds with a date cut the sorted timestamp index; bounds with only a time of day
+        ('HH:MM[:SS]') select that part of every day and wrap around midnight when `since`
+        is later than `until`. Only the smaller of the time slice and the level rows is
+        scanned for the other predicates.
+
+        Args:
+            log_lvl (str): Log level (case-insensitive).
+            since (str): Start of the range: 'YYYY-MM-DD[ HH:MM[:SS]]' or 'HH:MM[:SS]'.
+            until (str): End of the range (included), in the same formats.
+            contains (str): Substring of the content.
+            pattern (str): Regular expression searched in the content.
+
+        Returns:
+            List[int]: Sorted row numbers.
+
+        Raises:
+            ValueError: If a bound has an unknown format.
+        """
+        low, low_time = parse_bound(since, end=False) if since else (None, None)
+        high, high_time = parse_bound(until, end=True) if until else (None, None)
+
+        predicates = []
+        rows = None
+        if low is not None or high is not None:
+            low, high = low or 0, high or MAX_TIMESTAMP
+            rows = range(*self._cut(low, high))
+
+        if log_lvl is not None:
+            codes = {code for level, code in self.level_codes.items() if level.lower() == log_lvl.lower()}
+            if rows is not None and len(rows) <= sum(len(self.rows_by_level[code]) for code in codes):
+                level_column = self.level_column
+                predicates.append(lambda row: level_column[row] in codes)
+            else:
+                if rows is not None:
+                    # Fewer rows of the level than in the time slice: check their timestamps instead.
+                    date_column, time_column = self.date_column, self.time_column
+                    predicates.append(lambda row: low <= date_column[row] * 1000000 + time_column[row] <= high)
+                rows = self.select_level(log_lvl)
+
+        if rows is None:
+            rows = range(len(self))
+        elif isinstance(rows, range):
+            rows = self._slice_rows(rows.start, rows.stop)
+
+        if low_time is not None or high_time is not None:
+            predicates.append(time_of_day_predicate(self.time_column, low_time, high_time))
+        if contains is not None:
+            if isinstance(rows, range) and not predicates:
+                rows = self._rows_containing(contains)
+            else:
+                content = self.content
+                predicates.append(lambda row: contains in content(row))
+        if pattern is not None:
+            search = re.compile(pattern).search
+            content = self.content
+            predicates.append(lambda row: search(content(row)) is not None)
+
+        for predicate in predicates:
+            rows = [row for row in rows if predicate(row)]
+        return rows if isinstance(rows, list) else list(rows)
+
+    def format_rows(self, rows: Iterable[int]) -> Generator[str, None, None]:
+        """
+        Format rows as '<date> <time> - <content>'.
+
+        Args:
+            rows (Iterable[int]): Row numbers.
+
+        Yields:
+            Generator[str, None, None]: Formatted messages.
+        """
+        # Many rows share a date and a time: format each packed value once.
+        dates, times = {}, {}
+        date_column, time_column, content = self.date_column, self.time_column, self.content
+        for index in rows:
+            date, time = date_column[index], time_column[index]
+            date_text = dates.get(date)
+            if date_text is None:
+                date_text = dates[date] = format_date(date)
+            time_text = times.get(time)
+            if time_text is None:
+                time_text = times[time] = format_time(time)
+            yield f"{date_text} {time_text} - {content(index)}"
+
+    def _cut(self, low: int, high: int) -> Tuple[int, int]:
+        """
+        Positions of the packed timestamps range [low, high] in the sorted timestamp index.
+        """
+        self._update_timestamp_index()
+        return bisect_left(self._stamps, low), bisect_right(self._stamps, high)
+
+    def _slice_rows(self, start: int, end: int) -> List[int]:
+        """
+        Sorted rows of a slice of the timestamp index.
+        """
+        if self._order is None:
+            return list(range(start, end))
+        return sorted(self._order[start:end])
+
+    def _update_timestamp_index(self) -> None:
+        indexed = len(self._stamps)
+        if indexed == len(self):
+            return
+
+        if np is not None:
+            dates = np.frombuffer(self.date_column, dtype=np.uint32)[indexed:].astype(np.uint64)
+            new_stamps = array('Q', (dates * 1000000 + np.frombuffer(self.time_column, dtype=np.uint32)[indexed:]).tobytes())
+        else:
+            new_stamps = array('Q', (date * 1000000 + time for date, time in
+                                     zip(islice(self.date_column, indexed, None), islice(self.time_column, indexed, None))))
+
+        in_order = all(a <= b for a, b in zip(new_stamps, islice(new_stamps, 1, None)))
+        if self._order is None and in_order and (not indexed or self._stamps[-1] <= new_stamps[0]):
+            self._stamps.extend(new_stamps)
+            return
+
+        # Out of order rows: keep the rows sorted by timestamp (stable, so by row within a second).
+        stamps = self._stamps + new_stamps if self._order is None else None
+        if stamps is None:
+            stamps = array('Q', bytes(8 * len(self)))
+            for position, row in enumerate(self._order):
+                stamps[row] = self._stamps[position]
+            stamps[indexed:] = new_stamps
+        order = sorted(range(len(stamps)), key=stamps.__getitem__)
+        self._order = array('I', order)
+        self._stamps = array('Q', (stamps[row] for row in order))
+
+    def _rows_containing(self, text: str) -> List[int]:
+        """
+        Rows whose content contains the text, found by searching the whole content buffer.
+        """
+        needle = text.encode('utf-8')
+        if not needle:
+            return list(range(len(self)))
+        buffer, offsets = self.content_buffer, self.content_offsets
+        rows = []
+        position = buffer.find(needle)
+        while position != -1:
+            row = bisect_right(offsets, position) - 1
+            # Skip matches spanning two contents.
+            if position + len(needle) <= offsets[row + 1]:
+                rows.append(row)
+            position = buffer.find(needle, offsets[row + 1])
+        return rows
+
+MAX_TIMESTAMP = 99991231235959
+
+_BOUND_FORMATS = [
+    (re.compile(r"(\d{4})-(\d{2})-(\d{2})"), "date"),
+    (re.compile(r"(\d{4})-(\d{2})-(\d{2})[ T](\d{2}):(\d{2})(?::(\d{2}))?"), "datetime"),
+    (re.compile(r"(\d{2}):(\d{2})(?::(\d{2}))?"), "time"),
+]
+
+def parse_bound(bound: str, end: bool) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse a query bound into a packed timestamp (YYYYMMDDHHMMSS) or a packed time of day (HHMMSS).
+
+    Missing parts of an end bound are filled up to the end of the day or minute,
+    so '--until 2024-01-22' includes the whole day.
+
+    Args:
+        bound (str): 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'.
+        end (bool): Whether it is the end of the range.
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: Packed timestamp and packed time of day, one of them None.
+
+    Raises:
+        ValueError: If the bound has an unknown format.
+    """
+    for regex, kind in _BOUND_FORMATS:
+        match = regex.fullmatch(bound.strip())
+        if match is None:
+            continue
+        parts = match.groups()
+        if kind == "date":
+            year, month, day = map(int, parts)
+            return (year * 10000 + month * 100 + day) * 1000000 + (235959 if end else 0), None
+        second = 59 if end else 0
+        if kind == "datetime":
+            year, month, day, hour, minute = map(int, parts[:5])
+            second = int(parts[5]) if parts[5] is not None else second
+            return (year * 10000 + month * 100 + day) * 1000000 + hour * 10000 + minute * 100 + second, None
+        hour, minute = int(parts[0]), int(parts[1])
+        second = int(parts[2]) if parts[2] is not None else second
+        return None, hour * 10000 + minute * 100 + second
+    raise ValueError(f"Unknown time bound format: '{bound}'. Use 'YYYY-MM-DD[ HH:MM[:SS]]' or 'HH:MM[:SS]'")
+
+def time_of_day_predicate(time_column: array, low: Optional[int], high: Optional[int]):
+    """
+    Build a row predicate checking the packed time of day is within [low, high].
+    A range with `low` later than `high` wraps around midnight.
+    """
+    low = 0 if low is None else low
+    high = 235959 if high is None else high
+    if low <= high:
+        return lambda row: low <= time_column[row] <= high
+    return lambda row: time_column[row] >= low or time_column[row] <= high
+
+def pack_timestamp(timestamp: str) -> int:
+    """
+    Pack 'YYYY-MM-DD HH:MM:SS' into the integer YYYYMMDDHHMMSS, which sorts like the timestamp.
+
+    Args:
+        timestamp (str): Date and time separated by a space.
+
+    Returns:
+        int: Packed timestamp.
+    """
+    date, time = timestamp.split()
+    return int(date.replace('-', '')) * 1000000 + int(time.replace(':', ''))
+
+def format_date(date: int) -> str:
+    """
+    Format a packed YYYYMMDD date as 'YYYY-MM-DD'.
+    """
+    return f"{date // 10000:04d}-{date // 100 % 100:02d}-{date % 100:02d}"
+
+def format_time(time: int) -> str:
+    """
+    Format a packed HHMMSS time as 'HH:MM:SS'.
+    """
+    return f"{time // 10000:02d}:{time // 100 % 100:02d}:{time % 100:02d}"
@@ -1,23 +1,81 @@
+import io
+import os
 import re
-from typing import Pattern, Counter, Generator, List, Tuple
+import bz2
+import glob
+import gzip
+import lzma
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Pattern, Counter, Generator, Iterable, List, Tuple
+from ColumnarLogStore import ColumnarLogStore
+
+# Size of the blocks read from (and decompressed out of) the log files.
+READ_BUFFER_SIZE = 1 << 20
+
+def is_iso_date(field: str) -> bool:
+    """
+    Plain string check equal to the `\\d{4}-\\d{2}-\\d{2}` pattern.
+    """
+    return (len(field) == 10 and field[4] == '-' and field[7] == '-'
+            and field[:4].isdecimal() and field[5:7].isdecimal() and field[8:].isdecimal())
+
+def is_clock_time(field: str) -> bool:
+    """
+    Plain string check equal to the `[0-2][0-9]:[0-5][0-9]:[0-5][0-9]` pattern.
+    """
+    return (len(field) == 8 and field[2] == ':' and field[5] == ':'
+            and '0' <= field[0] <= '2' and '0' <= field[1] <= '9'
+            and '0' <= field[3] <= '5' and '0' <= field[4] <= '9'
+            and '0' <= field[6] <= '5' and '0' <= field[7] <= '9')
+
+# Field patterns of the log formats with plain string checks used by the fast path.
+FIELD_CHECKS = {
+    r"\d{4}-\d{2}-\d{2}": is_iso_date,
+    "[0-2][0-9]:[0-5][0-9]:[0-5][0-9]": is_clock_time,
+}
+
+# Maximum amount of checked values remembered per field by the fast path.
+FIELD_CACHE_SIZE = 100_000
+
+# Magic bytes of the supported compressed formats and the modules opening them.
+COMPRESSION_MAGIC = [
+    (b"\x1f\x8b", gzip),
+    (b"BZh", bz2),
+    (b"\xfd7zXZ\x00", lzma),
+]
 
 class SimpleLogParser:
     """
     SimpleLogParser class for parsing log files based on a specified format.
     """
+    # Position of the log level in the parsed messages.
+    level_index = 2
 
-    def __init__(self, log_format: List[Tuple[str, str]], indir='./') -> None:
+    def __init__(self, log_format: List[Tuple[str, str]], indir='./', columnar: bool = False) -> None:
         """
         Initialize the SimpleLogParser with a log format and an optional directory.
         
         Args:
             log_format (List[Tuple[str, str]]): List of headers and their corresponding regex patterns.
             indir (str): Directory where the log files are located.
+            columnar (bool): Store the messages in a `ColumnarLogStore` instead of `log_messages`;
+                the format must be Date, Time, Level and Content.
         """
         self.path = indir
         self.log_format = log_format
         self.log_messages = []
+        self.store = ColumnarLogStore() if columnar else None
+        # Fast path splitting lines without the regex, None if the format is not supported.
+        self.line_splitter = self.generate_line_splitter(log_format)
+        # Columnar copy of `log_messages` used to answer queries in the list storage mode.
+        self._query_store = None
+        self.level_counts = Counter()
         self.linecount = 0
+        # State of the follow mode: open log file, its inode and the unfinished last line.
+        self._follow_file = None
+        self._follow_inode = None
+        self._follow_pending = b""
 
     def parse(self, logname: str) -> None:
         """
@@ -29,16 +87,116 @@ class SimpleLogParser:
         headers, regex = self.generate_logformat_regex(self.log_format)
 
         for line in self.load_data(logname):
+            self.parse_line(line, headers, regex)
+
+    def parse_line(self, line: str, headers: List[str], regex: Pattern, store: bool = True) -> None:
+        """
+        Parse a single log line and account it in the statistics.
+
+        Args:
+            line (str): The log line.
+            headers (List[str]): Headers of the log format.
+            regex (Pattern): Compiled log format regex.
+            store (bool): Whether to store the message in `log_messages` (or in the columnar store).
+        """
+        message = self.line_splitter(line) if self.line_splitter is not None else None
+        if message is None:
             match = regex.search(line.strip())
-            try:
-                if match:
-                    message = [match.group(header) for header in headers]
-                    self.log_messages.append(message)
-                    self.linecount += 1
-                else:
-                    print(f"[Warning] Line does not match the format: {line.strip()}")
-            except Exception as e:
-                print(f"[Error] Failed to parse line: {line.strip()}. Error: {e}")
+            # Asking for the whole match too always gives a tuple, even for a single header.
+            message = list(match.group(0, *headers)[1:]) if match else None
+        try:
+            if message:
+                if store:
+                    if self.store is not None:
+                        self.store.append(message)
+                    else:
+                        self.log_messages.append(message)
+                self.level_counts[message[self.level_index]] += 1
+                self.linecount += 1
+            else:
+                print(f"[Warning] Line does not match the format: {line.strip()}")
+        except Exception as e:
+            print(f"[Error] Failed to parse line: {line.strip()}. Error: {e}")
+
+    def refresh(self, logname: str, store: bool = False) -> int:
+        """
+        Parse only the lines appended to the log file since the previous call.
+
+        The file stays open between calls. If the path gets a new inode (the log was rotated),
+        the rest of the old file is read first and the new file is read from the beginning;
+        if the file gets shorter than the read position (it was truncated), it is reread
+        from the beginning. An unfinished last line waits for the next call.
+
+        Args:
+            logname (str): Name of the log file to follow.
+            store (bool): Whether to store the messages in `log_messages`.
+
+        Returns:
+            int: Amount of new lines.
+        """
+        headers, regex = self.generate_logformat_regex(self.log_format)
+        lines = 0
+
+        try:
+            inode = os.stat(logname).st_ino
+        except FileNotFoundError:
+            # Between the rotation and the creation of the new file.
+            inode = None
+
+        if self._follow_file is not None:
+            if os.fstat(self._follow_file.fileno()).st_size < self._follow_file.tell():
+                self._follow_file.seek(0)
+                self._follow_pending = b""
+            lines += self._read_appended(headers, regex, store)
+            if inode is not None and inode != self._follow_inode:
+                self._follow_file.close()
+                self._follow_file = None
+
+        if self._follow_file is None and inode is not None:
+            self._follow_file = open(logname, 'rb')
+            self._follow_inode = inode
+            self._follow_pending = b""
+            lines += self._read_appended(headers, regex, store)
+        return lines
+
+    def follow(self, logname: str, interval: float = 60.0, callback=None) -> None:
+        """
+        Keep the statistics of a live log file up to date until interrupted.
+
+        Args:
+            logname (str): Name of the log file to follow.
+            interval (float): Seconds between two refreshes.
+            callback (Callable[[SimpleLogParser, int], None]): Called after each refresh with the amount of new lines.
+        """
+        try:
+            while True:
+                lines = self.refresh(logname)
+                if callback is not None:
+                    callback(self, lines)
+                time.sleep(interval)
+        finally:
+            if self._follow_file is not None:
+                self._follow_file.close()
+                self._follow_file = None
+
+    def _read_appended(self, headers: List[str], regex: Pattern, store: bool) -> int:
+        # Read in blocks, so a large backlog is never held in memory at once; a partial last
+        # line is carried over to the next block (and to the next refresh at the end).
+        count = 0
+        while True:
+            block = self._follow_file.read(READ_BUFFER_SIZE)
+            if not block:
+                return count
+            data = self._follow_pending + block
+            cut = data.rfind(b"\n") + 1
+            self._follow_pending = data[cut:]
+            if not cut:
+                continue
+
+            lines = data[:cut - 1].decode('utf-8', errors='replace').split("\n")
+            for line in lines:
+                self.parse_line(line, headers, regex, store)
+            count += len(lines)
     
     def count_by_level(self) -> Counter:
         """
@@ -47,7 +205,75 @@ class SimpleLogParser:
         Returns:
             Counter: A counter object with the count of messages per log level.
         """
-        return Counter([msg[2] for msg in self.log_messages])
+        return self.level_counts
+
+    def parse_parallel(self, logname: str, processes: int = None, chunk_size: int = 64 * 1024 * 1024) -> None:
+        """
+        Count log messages by level using a pool of processes, without storing the messages.
+
+        The file is split into byte ranges of about `chunk_size` bytes aligned to line ends;
+        each range is parsed in a worker process and the per-level counters are merged.
+        Compressed files are parsed by one worker each. Only `count_by_level` and
+        `linecount` are updated.
+
+        Args:
+            logname (str): Name of the log file to parse, a directory or a glob pattern.
+            processes (int): Number of worker processes, defaults to the number of CPUs.
+            chunk_size (int): Approximate size of the byte ranges in bytes.
+        """
+        log_paths = self.expand_paths(logname)
+        if not log_paths:
+            print(f"[Error] No log files found: {logname}")
+            return
+
+        tasks = []
+        unmatched = 0
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for log_path in log_paths:
+                try:
+                    if compression_of(log_path) is not None:
+                        # Compressed streams can't be split: one task per file.
+                        tasks.append(executor.submit(count_levels_in_file, log_path, self.log_format, self.level_index))
+                        continue
+                    ranges = self.split_into_ranges(log_path, chunk_size)
+                except OSError as e:
+                    print(f"[Error] Error reading file: {log_path}. Error: {e}")
+                    continue
+                tasks.extend(executor.submit(count_levels_in_range, log_path, start, end, self.log_format, self.level_index)
+                             for start, end in ranges)
+
+            for task in tasks:
+                counts, linecount, range_unmatched = task.result()
+                self.level_counts.update(counts)
+                self.linecount += linecount
+                unmatched += range_unmatched
+
+        if unmatched:
+            print(f"[Warning] {unmatched} lines do not match the format.")
+
+    @staticmethod
+    def split_into_ranges(path: str, chunk_size: int) -> List[Tuple[int, int]]:
+        """
+        Split a file into byte ranges of about `chunk_size` bytes, each ending after a newline.
+
+        Args:
+            path (str): Path to the file.
+            chunk_size (int): Approximate size of the ranges in bytes.
+
+        Returns:
+            List[Tuple[int, int]]: List of (start, end) byte offsets.
+        """
+        size = os.path.getsize(path)
+        ranges = []
+        with open(path, 'rb') as f:
+            start = 0
+            while start < size:
+                f.seek(min(start + chunk_size, size))
+                f.readline()
+                end = min(f.tell(), size)
+                ranges.append((start, end))
+                start = end
+        return ranges
 
     def generate_logformat_regex(self, logformat: List[Tuple[str, str]]) -> Tuple[List[str], Pattern]:
         """
@@ -67,25 +293,107 @@ class SimpleLogParser:
         regex = r"\s+".join(f"(?P<{header}>{pattern})" for header, pattern in logformat)
 
         return headers, re.compile(f"^{regex}$")
+
+    @staticmethod
+    def generate_line_splitter(logformat: List[Tuple[str, str]]) -> Optional[Callable[[str], Optional[List[str]]]]:
+        """
+        Generate a fast path for formats made of fields without whitespace, optionally ended by a `.*` field.
+
+        The line is split on whitespace at most `len(logformat) - 1` times and every field is
+        checked with a plain string test instead of the regex. Supported field patterns are
+        the ones in `FIELD_CHECKS` and alternations of literal words such as `INFO|ERROR`.
+
+        Args:
+            logformat (List[Tuple[str, str]]): List of headers and their corresponding regex patterns.
+
+        Returns:
+            Optional[Callable[[str], Optional[List[str]]]]: Function returning the fields of a line, or None
+            if the line does not pass the checks (the regex has to decide then); None if the format
+            is not supported.
+        """
+        checks = []
+        for position, (_, pattern) in enumerate(logformat):
+            if pattern == ".*" and position == len(logformat) - 1:
+                checks.append(None)
+            elif pattern in FIELD_CHECKS:
+                checks.append((FIELD_CHECKS[pattern], set()))
+            elif re.fullmatch(r"\w+(\|\w+)*", pattern):
+                # All the valid values are known: nothing to check besides the set.
+                checks.append((None, set(pattern.split("|"))))
+            else:
+                return None
+
+        maxsplit = len(checks) - 1
+        checked = [(position, *entry) for position, entry in enumerate(checks) if entry is not None]
+        ends_with_content = checks[-1] is None
+
+        def split_line(line: str) -> Optional[List[str]]:
+            fields = line.split(None, maxsplit)
+            if len(fields) != len(checks):
+                return None
+            # Dates, times and levels repeat a lot: remember the values which passed the checks.
+            for position, check, valid in checked:
+                field = fields[position]
+                if field not in valid:
+                    if check is None or not check(field):
+                        return None
+                    if len(valid) < FIELD_CACHE_SIZE:
+                        valid.add(field)
+            if ends_with_content:
+                # The content keeps its inner whitespace, but not the trailing one;
+                # like `.` in the regex, it can't contain a line break.
+                fields[-1] = fields[-1].rstrip()
+                if '\n' in fields[-1]:
+                    return None
+            return fields
+
+        return split_line
     
     def load_data(self, path: str) -> Generator[str, None, None]:
         """
         Load data from the log file.
+
+        Files compressed with gzip, bzip2 or xz are detected by their first bytes and
+        decompressed on the fly. The path may also be a directory or a glob pattern of
+        (rotated) log files, which are read from the oldest to the newest one.
         
         Args:
-            path (str): Path to the log file.
+            path (str): Path to the log file, a directory or a glob pattern.
         
         Yields:
             Generator[str, None, None]: Generator yielding lines from the log file.
         """
-        try:
-            with open(path, 'r', encoding='utf-8') as log_file:
-                for line in log_file:
-                    yield line
-        except FileNotFoundError:
-            print(f"[Error] File not found: {path}")
-        except Exception as e:
-            print(f"[Error] Error reading file: {path}. Error: {e}")
+        log_paths = self.expand_paths(path)
+        if not log_paths:
+            print(f"[Error] No log files found: {path}")
+        for log_path in log_paths:
+            try:
+                with open_log(log_path) as log_file:
+                    for line in log_file:
+                        yield line
+            except FileNotFoundError:
+                print(f"[Error] File not found: {log_path}")
+            except Exception as e:
+                print(f"[Error] Error reading file: {log_path}. Error: {e}")
+
+    @staticmethod
+    def expand_paths(path: str) -> List[str]:
+        """
+        Expand a directory or a glob pattern into its files ordered by modification time.
+
+        Args:
+            path (str): Path to a file, a directory or a glob pattern.
+
+        Returns:
+            List[str]: Paths of the log files, the oldest first; the path itself if it is a file.
+        """
+        if os.path.isdir(path):
+            paths = [entry.path for entry in os.scandir(path) if entry.is_file()]
+        elif glob.has_magic(path):
+            paths = [match for match in glob.glob(path) if os.path.isfile(match)]
+        else:
+            return [path]
+        return sorted(paths, key=lambda log_path: (os.path.getmtime(log_path), log_path))
 
     def display_log_level_statistics(self) -> None:
         """
@@ -116,6 +424,8 @@ class SimpleLogParser:
         Returns:
             List[str]: List of log messages that match the specified log level.
         """
+        if self.store is not None:
+            return list(self.store.format_rows(self.store.select_level(log_lvl)))
         filtered_logs = filter(lambda log_msg: log_msg[2].lower() == log_lvl.lower(), self.log_messages)
         return [f"{date} {time} - {content}" for date, time, _, content in filtered_logs]
     
@@ -129,7 +439,140 @@ class SimpleLogParser:
         Yields:
             Generator[str, None, None]: Generator yielding log messages that match the specified log level.
         """
+        if self.store is not None:
+            yield from self.store.format_rows(self.store.select_level(log_lvl))
+            return
         for date, time, _, content in filter(lambda log_msg: log_msg[2].lower() == log_lvl.lower(), self.log_messages):
             yield f"{date} {time} - {content}"
 
-    
\ No newline at end of file
+    def query(self, log_lvl: str = None, since: str = None, until: str = None,
+              contains: str = None, pattern: str = None) -> Generator[str, None, None]:
+        """
+        Filter log messages by a combination of level, time range and content predicates.
+
+        Only the Date, Time, Level and Content log format is supported (the layout of
+        `ColumnarLogStore`). Messages parsed into `log_messages` are first copied into a
+        columnar store, so create the parser with `columnar=True` to query large logs.
+
+        Example: ERROR messages between 08:00 and 09:00 containing 'timeout':
+            parser.query('error', since='08:00', until='09:00', contains='timeout')
+
+        Args:
+            log_lvl (str): Log level to filter by.
+            since (str): Start of the range: 'YYYY-MM-DD[ HH:MM[:SS]]' or time of day 'HH:MM[:SS]'.
+            until (str): End of the range (included), in the same formats.
+            contains (str): Substring of the message content.
+            pattern (str): Regular expression searched in the message content.
+
+        Yields:
+            Generator[str, None, None]: Generator yielding matching log messages in the log order.
+        """
+        store = self.store
+        if store is None:
+            # The list storage is append-only: copy only the messages added since the last query.
+            if self._query_store is None:
+                self._query_store = ColumnarLogStore()
+            store = self._query_store
+            for message in self.log_messages[len(store):]:
+                store.append(message)
+        yield from store.format_rows(store.query(log_lvl, since, until, contains, pattern))
+
+def count_levels_in_range(path: str, start: int, end: int, log_format: List[Tuple[str, str]], level_index: int) -> Tuple[Counter, int, int]:
+    """
+    Count log messages by level in a byte range of the log file (worker of `SimpleLogParser.parse_parallel`).
+
+    Args:
+        path (str): Path to the log file.
+        start (int): Offset of the first byte of the range; must be a line start.
+        end (int): Offset after the last byte of the range; must be a line end.
+        log_format (List[Tuple[str, str]]): List of headers and their corresponding regex patterns.
+        level_index (int): Position of the log level header in the format.
+
+    Returns:
+        Tuple[Counter, int, int]: Counts per level, amount of parsed and of unmatched lines.
+    """
+    with open(path, 'rb') as log_file:
+        log_file.seek(start)
+        data = log_file.read(end - start).decode('utf-8', errors='replace')
+    # Split on line feeds only, like the text mode reading of `parse`: `str.splitlines`
+    # also breaks lines at form feeds, vertical tabs and other Unicode line separators.
+    lines = data.split("\n")
+    if not lines[-1]:
+        lines.pop()
+    return count_levels(lines, log_format, level_index)
+
+def count_levels_in_file(path: str, log_format: List[Tuple[str, str]], level_index: int) -> Tuple[Counter, int, int]:
+    """
+    Count log messages by level in a whole (compressed) log file (worker of `SimpleLogParser.parse_parallel`).
+
+    Args:
+        path (str): Path to the log file.
+        log_format (List[Tuple[str, str]]): List of headers and their corresponding regex patterns.
+        level_index (int): Position of the log level header in the format.
+
+    Returns:
+        Tuple[Counter, int, int]: Counts per level, amount of parsed and of unmatched lines.
+    """
+    with open_log(path) as log_file:
+        return count_levels(log_file, log_format, level_index)
+
+def count_levels(lines: Iterable[str], log_format: List[Tuple[str, str]], level_index: int) -> Tuple[Counter, int, int]:
+    """
+    Count log messages by level.
+
+    Returns:
+        Tuple[Counter, int, int]: Counts per level, amount of parsed and of unmatched lines.
+    """
+    headers, regex = SimpleLogParser(log_format).generate_logformat_regex(log_format)
+    split_line = SimpleLogParser.generate_line_splitter(log_format)
+    level_header = headers[level_index]
+    counts = Counter()
+    linecount = 0
+    unmatched = 0
+
+    for line in lines:
+        fields = split_line(line) if split_line is not None else None
+        if fields is not None:
+            counts[fields[level_index]] += 1
+            linecount += 1
+            continue
+        match = regex.search(line.strip())
+        if match:
+            counts[match.group(level_header)] += 1
+            linecount += 1
+        else:
+            unmatched += 1
+    return counts, linecount, unmatched
+
+def compression_of(path: str):
+    """
+    Detect the compression of a file by its first bytes.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        Module opening the file (`gzip`, `bz2` or `lzma`), or None for an uncompressed file.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, module in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return module
+    return None
+
+def open_log(path: str) -> io.TextIOBase:
+    """
+    Open a plain or compressed log file as text read in blocks of `READ_BUFFER_SIZE` bytes.
+
+    Args:
+        path (str): Path to the log file.
+
+    Returns:
+        io.TextIOBase: Text stream of the (decompressed) log lines.
+    """
+    module = compression_of(path)
+    if module is None:
+        return open(path, 'r', encoding='utf-8', errors='replace', buffering=READ_BUFFER_SIZE)
+    stream = io.BufferedReader(module.open(path, 'rb'), buffer_size=READ_BUFFER_SIZE)
+    return io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
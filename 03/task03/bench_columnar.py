@@ -0,0 +1,73 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from SimpleLogParser import SimpleLogParser
+from main import log_format
+
+LEVELS = ["INFO", "INFO", "INFO", "DEBUG", "DEBUG", "WARNING", "ERROR"]
+CONTENTS = ["User logged in successfully", "Attempting to connect to the database", "Disk usage above 80%",
+            "Database connection failed", "Data backup completed", "Starting data backup process",
+            "Memory usage is high", "User logged out", "Scheduled maintenance"]
+
+def generate_log(path: str, lines: int) -> None:
+    """Writes a log of `lines` messages in the format of `main.log_format`."""
+    stamp = time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1))
+    with open(path, 'w', encoding='utf-8') as log_file:
+        for _ in range(lines):
+            stamp += random.randint(0, 3)
+            log_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stamp))} {random.choice(LEVELS)} {random.choice(CONTENTS)}\n")
+
+def measure(path: str, columnar: bool, level: str, since: str, until: str, memory: bool) -> None:
+    if memory:
+        tracemalloc.start()
+    parser = SimpleLogParser(log_format, columnar=columnar)
+    start = time.perf_counter()
+    parser.parse(path)
+    parsing = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] if memory else 0
+    tracemalloc.stop()
+
+    # Selection only (row numbers or rows), then selection with formatting of the messages.
+    start = time.perf_counter()
+    if columnar:
+        by_level = parser.store.select_level(level)
+    else:
+        by_level = [log_msg for log_msg in parser.log_messages if log_msg[2].lower() == level.lower()]
+    level_select = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parser.filter_by_log_level(level)
+    level_filter = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if columnar:
+        by_time = parser.store.select_time_range(since, until)
+    else:
+        by_time = [log_msg for log_msg in parser.log_messages if since <= f"{log_msg[0]} {log_msg[1]}" <= until]
+    time_select = time.perf_counter() - start
+
+    name = "columnar     " if columnar else "list-of-lists"
+    print(f"{name}: parse {parsing:.2f}s" + (f", {used / 2**20:,.1f} MiB" if memory else ""))
+    print(f"  level select {level_select:.4f}s ({len(by_level)} rows), level filter with formatting {level_filter:.4f}s")
+    print(f"  time range select {time_select:.4f}s ({len(by_time)} rows)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the columnar store vs the list-of-lists storage.")
+    parser.add_argument('-n', '--lines', type=int, default=10_000_000, help="Amount of generated log lines.")
+    parser.add_argument('-l', '--level', default="error", help="Level to filter by.")
+    parser.add_argument('--since', default="2024-01-02 08:00:00", help="Start of the filtered time range.")
+    parser.add_argument('--until', default="2024-01-02 09:00:00", help="End of the filtered time range.")
+    parser.add_argument('-m', '--memory', action='store_true', help="Measure the memory of the parsed messages (slows parsing down).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.log")
+        generate_log(path, args.lines)
+        measure(path, False, args.level, args.since, args.until, args.memory)
+        measure(path, True, args.level, args.since, args.until, args.memory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import os
+import tempfile
+import time
+from SimpleLogParser import SimpleLogParser
+from bench_columnar import generate_log
+from main import log_format
+
+def measure(path: str, fast_path: bool, repeat: int) -> float:
+    elapsed = float('inf')
+    for _ in range(repeat):
+        parser = SimpleLogParser(log_format)
+        if not fast_path:
+            parser.line_splitter = None
+        start = time.perf_counter()
+        parser.parse(path)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    name = "fast path" if fast_path else "regex    "
+    print(f"{name}: {elapsed:.2f}s ({parser.linecount / elapsed:,.0f} lines/s), {dict(parser.count_by_level())}")
+    return elapsed
+
+def measure_lines(path: str) -> None:
+    """Times only the splitting of lines already in memory."""
+    parser = SimpleLogParser(log_format)
+    headers, regex = parser.generate_logformat_regex(log_format)
+    with open(path, encoding='utf-8') as log_file:
+        lines = log_file.readlines()
+
+    start = time.perf_counter()
+    for line in lines:
+        match = regex.search(line.strip())
+        [match.group(header) for header in headers]
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for line in lines:
+        parser.line_splitter(line)
+    fast_time = time.perf_counter() - start
+    print(f"Line splitting only: regex {regex_time:.2f}s, fast path {fast_time:.2f}s, speedup {regex_time / fast_time:.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the log format regex vs the split-and-check fast path.")
+    parser.add_argument('-n', '--lines', type=int, default=1_000_000, help="Amount of generated log lines.")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="Runs per variant, the best one is reported.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.log")
+        generate_log(path, args.lines)
+        regex = measure(path, False, args.repeat)
+        fast = measure(path, True, args.repeat)
+        print(f"Speedup: {regex / fast:.1f}x")
+        measure_lines(path)
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import argparse
+import time
 from SimpleLogParser import SimpleLogParser
 
 # Define log format as a list of tuples with each header and its regex pattern.
@@ -11,25 +12,58 @@ log_format = [
 
 def main():
     arg_parser = argparse.ArgumentParser(description="Utility for parsing log file.")
+    arg_parser.add_argument('-p', '--path', type=str, default=log_file, help="Log file (plain, .gz, .bz2 or .xz), directory or glob pattern of rotated logs.")
     arg_parser.add_argument('-f', '--filter', type=str, help="Filters logs by specified log level.")
     arg_parser.add_argument('-s', '--statistics', type=bool, help="Display statistics by each log level.", default=True)
+    arg_parser.add_argument('-j', '--jobs', type=int, help="Count statistics in the given number of processes without storing messages.")
+    arg_parser.add_argument('--since', type=str, help="Shows messages logged since 'YYYY-MM-DD[ HH:MM[:SS]]' or, every day, since 'HH:MM[:SS]'.")
+    arg_parser.add_argument('--until', type=str, help="Shows messages logged until (including) the date, date and time or time of day.")
+    arg_parser.add_argument('--contains', type=str, help="Shows messages whose content contains the text.")
+    arg_parser.add_argument('--regex', type=str, help="Shows messages whose content matches the regular expression.")
+    arg_parser.add_argument('-c', '--columnar', action='store_true', help="Keep parsed messages in the compact columnar store.")
+    arg_parser.add_argument('--follow', type=float, metavar='SECONDS', help="Follow the growing log file and refresh statistics every SECONDS.")
 
     args = arg_parser.parse_args()
 
+    query = {"log_lvl": args.filter, "since": args.since, "until": args.until,
+             "contains": args.contains, "pattern": args.regex}
+    has_query = any(value is not None for value in query.values())
+
     try:
-        log_parser = SimpleLogParser(log_format)
-        log_parser.parse(log_file)
+        # Queries run on the columnar store, so parse into it directly instead of copying the messages.
+        log_parser = SimpleLogParser(log_format, columnar=args.columnar or has_query)
+
+        if args.follow:
+            def show(parser: SimpleLogParser, lines: int) -> None:
+                print(f"\n{time.strftime('%H:%M:%S')} - {lines} new lines")
+                parser.display_log_level_statistics()
+
+            log_parser.follow(args.path, args.follow, show)
+            return
+
+        # Messages are needed for filtering, so the parallel mode is used for statistics only.
+        if args.jobs and not has_query:
+            log_parser.parse_parallel(args.path, args.jobs)
+        else:
+            log_parser.parse(args.path)
 
         # Show statistics if requested.
         if args.statistics:
             log_parser.display_log_level_statistics()
 
-        # Filter logs if a filter is provided.
-        if args.filter:
-            print(f"\nDetails for log level '{args.filter.upper()}':")
-            for log in log_parser.filter_by_log_level_generator(args.filter):
+        # Filter logs if a filter or a query is provided.
+        if has_query:
+            if args.filter and sum(value is not None for value in query.values()) == 1:
+                print(f"\nDetails for log level '{args.filter.upper()}':")
+                logs = log_parser.filter_by_log_level_generator(args.filter)
+            else:
+                print("\nMessages matching the query:")
+                logs = log_parser.query(**query)
+            for log in logs:
                 print(log)
             
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
         print(f"Unexpected error: {e}.")
 
@@ -0,0 +1,35 @@
+import argparse
+import timeit
+from booklib.entities import AddressBook, Record
+from main import execute, parse_input
+
+# Commands that do not print by themselves, so only dispatch and handler time is measured.
+COMMAND_LINES = [
+    "hello",
+    "phone user1",
+    "show-birthday user1",
+    "change user1 0123456789 0123456789",
+    "phone",
+    "unknown-command",
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark of the bot command dispatch latency.")
+    parser.add_argument('-n', '--number', type=int, default=100_000, help="Calls per command.")
+    args = parser.parse_args()
+
+    book = AddressBook()
+    record = Record("user1")
+    record.add_phone("0123456789")
+    record.add_birthday("01.01.1990")
+    book.add_record(record)
+
+    print(f"{'Command':<40}| {'ns/call':>8}")
+    print(f"{'-' * 40}|{'-' * 9}")
+    for line in COMMAND_LINES:
+        command, *cmd_args = parse_input(line)
+        elapsed = timeit.timeit(lambda: execute(command, cmd_args, book), number=args.number)
+        print(f"{line:<40}| {elapsed / args.number * 1e9:8.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import gc
+import tracemalloc
+from booklib.entities import Record
+from booklib.compact import CompactRecord
+
+def measure(record_type: type, count: int, phones: int) -> int:
+    """
+    Measures memory allocated by `count` records with `phones` phone numbers and a birthday each.
+
+    Args:
+        record_type (type): Record class to measure.
+        count (int): Number of records.
+        phones (int): Number of phone numbers per record.
+
+    Returns:
+        int: Allocated bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    records = []
+    for i in range(count):
+        record = record_type(f"user{i}")
+        for j in range(phones):
+            record.add_phone(f"{(i * phones + j) % 10**10:010d}")
+        record.add_birthday(f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.1990")
+        records.append(record)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory benchmark of Record vs CompactRecord.")
+    parser.add_argument('-n', '--count', type=int, default=100_000, help="Number of records.")
+    parser.add_argument('-p', '--phones', type=int, default=2, help="Phone numbers per record.")
+    args = parser.parse_args()
+
+    results = {cls.__name__: measure(cls, args.count, args.phones) for cls in (Record, CompactRecord)}
+    for name, allocated in results.items():
+        print(f"{name:<15}: {allocated / 2**20:8.1f} MiB, {allocated / args.count:6.0f} B/record")
+    print(f"Ratio: {results['Record'] / results['CompactRecord']:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import re
+import sys
+from array import array
+from datetime import date
+import booklib.exceptions as booklibex
+from booklib.entities import Name, Phone, Birthday
+
+class CompactRecord:
+    """
+    Memory-compact contact record with the same public API as `Record`.
+
+    The record has no instance `__dict__`: the name is stored as an interned string,
+    phones are packed as 64-bit integers into an `array('Q')` and the birthday is kept
+    as a date ordinal. `name`, `phones` and `birthday` build the usual field objects on
+    access, so changing the returned objects does not change the record.
+    """
+    __slots__ = ("_name", "_phones", "_birthday", "_book")
+
+    def __init__(self, name: str) -> None:
+        self._name = sys.intern(name)
+        self._phones = array("Q")
+        self._birthday = 0
+        self._book = None
+
+    @property
+    def name(self) -> Name:
+        return Name(self._name)
+
+    @property
+    def phones(self) -> list[Phone]:
+        return [Phone(self._unpack(p)) for p in self._phones]
+
+    @property
+    def birthday(self) -> Birthday:
+        if not self._birthday:
+            return None
+        return Birthday(date.fromordinal(self._birthday))
+
+    def show_phones(self, delim=";") -> str:
+        """
+        Show all phone numbers of the contact separated by a delimiter.
+        """
+        return delim.join(self._unpack(p) for p in self._phones)
+
+    def add_phone(self, phone: str) -> None:
+        """
+        Add a phone number to the contact.
+        """
+        self._phones.append(self._pack(phone))
+        if self._book is not None:
+            self._book._phone_added(self, phone)
+
+    def remove_phone(self, phone: str) -> None:
+        """
+        Remove a phone number from the contact.
+        """
+        if re.match(r"^\d{10}$", phone):
+            packed = int(phone)
+            self._phones = array("Q", (p for p in self._phones if p != packed))
+        if self._book is not None:
+            self._book._phone_removed(self, phone)
+
+    def edit_phone(self, old_phone: str, new_phone: str) -> None:
+        """
+        Edit a phone number of the contact.
+        """
+        phone_info = self.find_phone(old_phone)
+        if phone_info is not None:
+            index, _ = phone_info
+            self._phones[index] = self._pack(new_phone)
+            if self._book is not None:
+                self._book._phone_changed(self, old_phone, new_phone)
+
+    def find_phone(self, phone: str) -> tuple[int, Phone]:
+        """
+        Find a phone number in the contact's phone list.
+        """
+        if not re.match(r"^\d{10}$", phone):
+            return None
+        packed = int(phone)
+        for i, p in enumerate(self._phones):
+            if p == packed:
+                return (i, Phone(phone))
+        return None
+
+    def add_birthday(self, birthday: str | date) -> None:
+        """
+        Set the contact's birthday from a '%d.%m.%Y' string or a date.
+        """
+        old_birthday = self.birthday
+        self._birthday = Birthday(birthday).value.toordinal()
+        if self._book is not None:
+            self._book._birthday_changed(self, old_birthday)
+
+    def _pack(self, phone: str) -> int:
+        if not re.match(r"^\d{10}$", phone):
+            raise booklibex.InvalidPhoneNumberException(phone)
+        return int(phone)
+
+    def _unpack(self, phone: int) -> str:
+        return f"{phone:010d}"
+
+    def __str__(self) -> str:
+        return f"{self._name}, phones: {self.show_phones()}"
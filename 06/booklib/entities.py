@@ -1,12 +1,23 @@
 import re
 import pickle
 import copy
+import calendar
 import booklib.exceptions as booklibex
-from datetime import datetime, timedelta
+from booklib.search import NameIndex
+from datetime import date, datetime, timedelta
 from collections import UserDict
 
 BDAY_FORMAT = "%d.%m.%Y"
 
+def format_birthday(value) -> str:
+    """
+    Format a date as a birthday accepted by `Birthday`.
+
+    `strftime(BDAY_FORMAT)` is not used: on some platforms it does not zero-pad years
+    below 1000, which `Birthday` then rejects.
+    """
+    return f"{value.day:02d}.{value.month:02d}.{value.year:04d}"
+
 class Field:
     """
     Base class for different fields.
@@ -36,8 +47,13 @@ class Phone(Field):
 class Birthday(Field):
     """
     Class for storing birthdays in the correct format.
+
+    Accepts a string in '%d.%m.%Y' format or a `date`, which is stored as is.
     """
-    def __init__(self, value: str):
+    def __init__(self, value):
+        if isinstance(value, date):
+            super().__init__(value)
+            return
         if not re.match(r"(^0[1-9]|[12][0-9]|3[01])\.(0[1-9]|1[0-2])\.(\d{4}$)", value):
             raise booklibex.InvalidBirthdayException(value, BDAY_FORMAT)
         super().__init__(datetime.strptime(value, BDAY_FORMAT).date())
@@ -46,6 +62,9 @@ class Record:
     """
     Class for storing a contact record, including a name and multiple phone numbers.
     """
+    # Address book the record belongs to; used to keep the book's indexes in sync.
+    _book = None
+
     def __init__(self, name: str) -> None:
         self.name = Name(name)
         self.phones = []
@@ -64,12 +83,16 @@ class Record:
         Add a phone number to the contact.
         """
         self.phones.append(Phone(phone))
+        if self._book is not None:
+            self._book._phone_added(self, phone)
 
     def remove_phone(self, phone: str):
         """
         Remove a phone number from the contact.
         """
         self.phones = [p for p in self.phones if p.value != phone]
+        if self._book is not None:
+            self._book._phone_removed(self, phone)
 
     def edit_phone(self, old_phone: str, new_phone: str) -> None:
         """
@@ -79,6 +102,8 @@ class Record:
         if phone_info is not None:
             index, _ = phone_info
             self.phones[index] = Phone(new_phone)
+            if self._book is not None:
+                self._book._phone_changed(self, old_phone, new_phone)
 
     def find_phone(self, phone: str) -> tuple[int, Phone]:
         """
@@ -89,11 +114,14 @@ class Record:
                 return (i, p)
         return None
     
-    def add_birthday(self, birthday: str) -> None:
+    def add_birthday(self, birthday: str | date) -> None:
         """
-        Set the contact's birthday.
+        Set the contact's birthday from a '%d.%m.%Y' string or a date.
         """
+        old_birthday = self.birthday
         self.birthday = Birthday(birthday)
+        if self._book is not None:
+            self._book._birthday_changed(self, old_birthday)
 
     def __str__(self) -> str:
         return f"{self.name.value}, phones: {';'.join(str(p) for p in self.phones)}"
@@ -101,12 +129,144 @@ class Record:
 class AddressBook(UserDict):
     """
     Class for storing a collection of records, indexed by name.
+
+    Besides the name index the book keeps a reverse phone index (phone -> name, or
+    the set of names when several records share the phone) and a birthday index bucketed by (month, day), which records update through
+    their back-reference to the book. Every mutation is also forwarded to the
+    attached journal (see booklib.journal), if any.
+
+    `record_type` selects the class used by `new_record`, e.g. the memory-compact
+    `booklib.compact.CompactRecord`.
     """
+    journal = None
+    record_type = Record
+
+    def __init__(self, *args, record_type: type = None, **kwargs) -> None:
+        self.phone_index = {}
+        self.birthday_index = {}
+        self.name_index = NameIndex()
+        if record_type is not None:
+            self.record_type = record_type
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        if name in self.data:
+            self._unindex(self.data[name])
+        self._attach(name, record)
+        if self.journal is not None:
+            birthday = format_birthday(record.birthday.value) if record.birthday is not None else None
+            self.journal.append("add", name, [phone.value for phone in record.phones], birthday)
+
+    def __delitem__(self, name: str) -> None:
+        record = self.data.pop(name)
+        self._unindex(record)
+        self.name_index.remove(name)
+        record._book = None
+        if self.journal is not None:
+            self.journal.append("delete", name)
+
+    def __getstate__(self) -> dict:
+        # The indexes are rebuilt by `__setstate__`, so they are not stored.
+        state = self.__dict__.copy()
+        for attr in ("journal", "phone_index", "birthday_index", "name_index"):
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        # Books pickled before the indexes existed carry no index attributes.
+        self.__dict__.update(state)
+        self.reindex()
+
+    def reindex(self) -> None:
+        """
+        Rebuild all lookup indexes from the records in the book.
+        """
+        self.phone_index = {}
+        self.birthday_index = {}
+        for name, record in self.data.items():
+            self._attach(name, record, index_name=False)
+        self.name_index = NameIndex(self.data)
+
+    def _attach(self, name: str, record: Record, index_name: bool = True) -> None:
+        self.data[name] = record
+        if index_name:
+            self.name_index.add(name)
+        record._book = self
+        for phone in record.phones:
+            self._index_phone(phone.value, name)
+        if record.birthday is not None:
+            self._bucket(record.birthday).add(name)
+
+    def _unindex(self, record: Record) -> None:
+        for phone in record.phones:
+            self._unindex_owner(phone.value, record.name.value)
+        if record.birthday is not None:
+            self._bucket(record.birthday).discard(record.name.value)
+
+    def _phone_added(self, record: Record, phone: str) -> None:
+        self._index_phone(phone, record.name.value)
+        if self.journal is not None:
+            self.journal.append("add-phone", record.name.value, phone)
+
+    def _phone_removed(self, record: Record, phone: str) -> None:
+        self._unindex_phone(record, phone)
+        if self.journal is not None:
+            self.journal.append("remove-phone", record.name.value, phone)
+
+    def _phone_changed(self, record: Record, old_phone: str, new_phone: str) -> None:
+        self._unindex_phone(record, old_phone)
+        self._index_phone(new_phone, record.name.value)
+        if self.journal is not None:
+            self.journal.append("edit-phone", record.name.value, old_phone, new_phone)
+
+    def _unindex_phone(self, record: Record, phone: str) -> None:
+        if record.find_phone(phone) is None:
+            self._unindex_owner(phone, record.name.value)
+
+    def _index_phone(self, phone: str, name: str) -> None:
+        # A single owner is stored as the name itself, a set is created only for shared phones.
+        owners = self.phone_index.get(phone)
+        if owners is None or owners == name:
+            self.phone_index[phone] = name
+        elif isinstance(owners, set):
+            owners.add(name)
+        else:
+            self.phone_index[phone] = {owners, name}
+
+    def _unindex_owner(self, phone: str, name: str) -> None:
+        owners = self.phone_index.get(phone)
+        if owners == name:
+            del self.phone_index[phone]
+        elif isinstance(owners, set):
+            owners.discard(name)
+            if len(owners) == 1:
+                self.phone_index[phone] = owners.pop()
+
+    def _birthday_changed(self, record: Record, old_birthday: Birthday) -> None:
+        if old_birthday is not None:
+            self._bucket(old_birthday).discard(record.name.value)
+        self._bucket(record.birthday).add(record.name.value)
+        if self.journal is not None:
+            self.journal.append("birthday", record.name.value, format_birthday(record.birthday.value))
+
+    def _bucket(self, birthday: Birthday) -> set:
+        key = (birthday.value.month, birthday.value.day)
+        return self.birthday_index.setdefault(key, set())
+
+    def new_record(self, name: str) -> Record:
+        """
+        Create an empty record of the book's record type (not added to the book).
+        """
+        return self.record_type(name)
+
+    def _born_on(self, month: int, day: int):
+        return self.birthday_index.get((month, day), ())
+
     def add_record(self, record: Record) -> None:
         """
         Add a new record to the address book.
         """
-        self.data[record.name.value] = record
+        self[record.name.value] = record
 
     def find(self, name: str) -> Record:
         """
@@ -114,39 +274,78 @@ class AddressBook(UserDict):
         """
         return self.data.get(name)
 
+    def find_by_phone(self, phone: str) -> Record:
+        """
+        Find a record by one of its phone numbers.
+
+        If several records share the phone, the one with the smallest name is returned.
+        """
+        name = self.phone_index.get(phone)
+        if name is None:
+            return None
+        if isinstance(name, set):
+            name = min(name)
+        return self.data.get(name)
+
+    def search(self, query: str, max_distance: int = 1, limit: int = 10) -> list[str]:
+        """
+        Find names starting with the query, followed by names within `max_distance` edits of it.
+
+        Args:
+            query (str): Full or partial name.
+            max_distance (int): Maximum edit distance for the fuzzy part of the result.
+            limit (int): Maximum number of returned names.
+
+        Returns:
+            list[str]: Matching names, prefix matches first.
+        """
+        names = self.name_index.complete(query, limit)
+        for name, _ in self.name_index.fuzzy(query, max_distance, limit):
+            if len(names) >= limit:
+                break
+            if name not in names:
+                names.append(name)
+        return names
+
     def delete(self, name: str) -> None:
         """
         Delete a record by name.
         """
         if name in self.data:
-            del self.data[name]
+            del self[name]
 
-    def get_upcoming_birthdays(self)->list[dict[str, str]]:
+    def get_upcoming_birthdays(self, days: int = 7) -> list[dict[str, str]]:
         """
-        Get a list of records with birthdays in the next 7 days.
+        Get a list of records with birthdays in the next `days` days (today included).
+
+        Only the birthday buckets of the dates in the window are visited. Birthdays on
+        Feb 29 are celebrated on Feb 28 in non-leap years.
+
+        Args:
+            days (int): Size of the window after today, defaults to 7.
 
         Returns:
             List of dictionaries with keys 'name' and 'congratulation_date' in '%d.%m.%Y' format.
         """
         today = datetime.now().date()
-        end_date = today + timedelta(days=7)
 
         greetings = []
 
-        for user_name, record in self.data.items():
-            # If birthday field is not specified then skip that user.
-            if record.birthday is None:
+        for offset in range(days + 1):
+            bday_this_year = today + timedelta(days=offset)
+            names = list(self._born_on(bday_this_year.month, bday_this_year.day))
+            if bday_this_year.month == 2 and bday_this_year.day == 28 and not calendar.isleap(bday_this_year.year):
+                names.extend(self._born_on(2, 29))
+            if not names:
                 continue
 
-            user_bday = record.birthday.value
-            bday_this_year = user_bday.replace(year=today.year)
+            congratulation_date = bday_this_year
+            if congratulation_date.weekday() == 5: # Saturday
+                congratulation_date += timedelta(days=2)
+            elif congratulation_date.weekday() == 6: # Sunday
+                congratulation_date += timedelta(days=1)
 
-            if today <= bday_this_year <= end_date:
-                if bday_this_year.weekday() == 5: # Saturday
-                    bday_this_year += timedelta(days=2)
-                elif bday_this_year.weekday() == 6: # Sunday
-                    bday_this_year += timedelta(days=1)
-                
-                greetings.append({'name': user_name, 'congratulation_date': bday_this_year.strftime(BDAY_FORMAT)})
+            for user_name in names:
+                greetings.append({'name': user_name, 'congratulation_date': congratulation_date.strftime(BDAY_FORMAT)})
 
-        return greetings
\ No newline at end of file
+        return greetings
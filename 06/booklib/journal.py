@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import pickle
+from booklib.entities import AddressBook
+from booklib.mapped import MappedAddressBook
+
+class BookJournal:
+    """
+    Write-ahead journal for an AddressBook.
+
+    Every mutation of the attached book is appended to the journal file as one JSON line
+    with a sequence number. The file is fsynced every `batch_size` operations and, once the
+    journal holds `compact_ratio` times as many operations as the book has records (but at
+    least `compact_every`), the whole book is written into the snapshot file and the journal
+    starts over, so the snapshot rewrites cost O(1) amortized I/O per operation. On start the snapshot is loaded and only the journal tail is replayed.
+    The snapshot is a pickle, or a mapped book file for `MappedAddressBook`.
+
+    Journal line format: [<seq>, <op>, <args>...], where op is one of
+    'add', 'delete', 'add-phone', 'remove-phone', 'edit-phone', 'birthday'.
+    """
+    def __init__(self, snapshot_path: str = "addressbook.pkl", journal_path: str = None,
+                 batch_size: int = 64, compact_every: int = 10000, compact_ratio: float = 0.5) -> None:
+        """
+        Args:
+            snapshot_path (str): File with the pickled snapshot of the book.
+            journal_path (str): Journal file, defaults to '<snapshot_path>.journal'.
+            batch_size (int): Number of operations between two fsync calls.
+            compact_every (int): Minimum number of journaled operations that triggers compaction,
+                0 disables compaction.
+            compact_ratio (float): Number of journaled operations per book record that triggers compaction.
+        """
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or f"{snapshot_path}.journal"
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self.compact_ratio = compact_ratio
+        self.compact_threshold = compact_every
+        self.book = None
+        self.seq = 0
+        self.pending = 0
+        self.journaled = 0
+        self._file = None
+
+    def open(self, book_factory=AddressBook) -> AddressBook:
+        """
+        Restore the book from the snapshot and the journal tail and start journaling its changes.
+
+        Args:
+            book_factory (Callable): Creates an empty book when there is no snapshot yet.
+
+        Returns:
+            (AddressBook): restored address book with this journal attached.
+        """
+        book, self.seq = self._load_snapshot(book_factory)
+        valid_size = self._replay(book)
+
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        # Cut off a torn last line left by a crash, so new entries start on a clean line.
+        self._file.truncate(valid_size)
+
+        self.book = book
+        book.journal = self
+        self._update_threshold()
+        return book
+
+    def append(self, op: str, *args) -> None:
+        """
+        Append an operation to the journal.
+
+        Args:
+            op (str): Operation name.
+            args: Operation arguments; must be JSON serializable.
+        """
+        if self._file is None:
+            return
+        self.seq += 1
+        self._file.write(json.dumps([self.seq, op, *args], ensure_ascii=False) + "\n")
+        self.pending += 1
+        self.journaled += 1
+
+        if self.batch_size and self.pending >= self.batch_size:
+            self.sync()
+        self.maybe_compact()
+
+    def sync(self) -> None:
+        """
+        Flush the buffered operations and fsync the journal file.
+        """
+        if self._file is None or not self.pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.pending = 0
+
+    def maybe_compact(self) -> None:
+        """
+        Compact the journal if it reached the compaction threshold.
+        """
+        if self.compact_every and self.journaled >= self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Write the whole book into the snapshot file and truncate the journal.
+        """
+        self.sync()
+        self.write_snapshot(self.book)
+        if self._file is not None:
+            self._file.truncate(0)
+            self._file.seek(0)
+        self.journaled = 0
+        self._update_threshold()
+
+    def _update_threshold(self) -> None:
+        # The book size is taken at compaction only: `len` of a mapped book is not free.
+        if self.book is not None:
+            self.compact_threshold = max(self.compact_every, int(self.compact_ratio * len(self.book)))
+
+    def write_snapshot(self, book: AddressBook) -> None:
+        """
+        Atomically replace the snapshot file with the given book.
+
+        Args:
+            book (AddressBook): The address book to be saved.
+        """
+        if isinstance(book, MappedAddressBook):
+            book.save(self.snapshot_path, seq=self.seq)
+            return
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"seq": self.seq, "book": book}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def close(self) -> None:
+        """
+        Sync the pending operations and detach the journal from the book.
+        """
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
+        if self.book is not None:
+            self.book.journal = None
+
+    def _load_snapshot(self, book_factory) -> tuple[AddressBook, int]:
+        if MappedAddressBook.is_mapped_file(self.snapshot_path):
+            book = book_factory()
+            if not isinstance(book, MappedAddressBook):
+                book = MappedAddressBook(record_type=book.record_type)
+            book.map(self.snapshot_path)
+            return book, book.seq
+
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return book_factory(), 0
+
+        # Plain pickled books are written by versions without the journal.
+        if isinstance(snapshot, dict) and "book" in snapshot:
+            return snapshot["book"], snapshot["seq"]
+        return snapshot, 0
+
+    def _replay(self, book: AddressBook) -> int:
+        """
+        Apply journal entries newer than the snapshot and return the size of the valid journal part.
+
+        Entries which cannot be applied (e.g. invalid data or a missing contact) are reported
+        to stderr and skipped.
+        """
+        valid_size = 0
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return valid_size
+
+        with f:
+            for line in f:
+                try:
+                    seq, op, *args = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                valid_size += len(line)
+                if seq <= self.seq:
+                    continue
+                try:
+                    self._apply(book, op, args)
+                except Exception as e:
+                    # One bad entry must not make the whole book unrecoverable.
+                    print(f"[Warning] Skipped journal entry {seq} ({op}): {e}", file=sys.stderr)
+                self.seq = seq
+                self.journaled += 1
+        return valid_size
+
+    def _apply(self, book: AddressBook, op: str, args: list) -> None:
+        if op == "add":
+            name, phones, birthday = args
+            record = book.new_record(name)
+            for phone in phones:
+                record.add_phone(phone)
+            if birthday is not None:
+                record.add_birthday(birthday)
+            book.add_record(record)
+        elif op == "delete":
+            book.delete(args[0])
+        elif op == "add-phone":
+            book.find(args[0]).add_phone(args[1])
+        elif op == "remove-phone":
+            book.find(args[0]).remove_phone(args[1])
+        elif op == "edit-phone":
+            book.find(args[0]).edit_phone(args[1], args[2])
+        elif op == "birthday":
+            book.find(args[0]).add_birthday(args[1])
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
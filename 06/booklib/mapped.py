@@ -0,0 +1,367 @@
+import os
+import mmap
+import heapq
+import struct
+from array import array
+from datetime import date
+from booklib.entities import AddressBook, Record
+from booklib.search import fuzzy
+
+MAGIC = b"BOOKMAP1"
+
+# File layout:
+#   header:  magic, journal sequence number, records count, name field size
+#   index:   <count> entries of (name padded with zero bytes, data offset), sorted by name
+#   data:    per record: birthday date ordinal (0 - no birthday), phones count, phones as uint64
+HEADER = struct.Struct("<8sQQI")
+RECORD_HEAD = struct.Struct("<IH")
+
+class MappedAddressBook(AddressBook):
+    """
+    Address book backed by a sorted, fixed-layout binary file opened with `mmap`.
+
+    Opening the file only reads its header. Records are found by binary search over the
+    name index and decoded on first access; decoded, added and changed records live in
+    `data` (the working set) and take precedence over the file, deleted ones are
+    remembered until the next `save`.
+
+    Lookups by phone and birthday cover the working set through the usual indexes; records
+    that are still only on disk are found by scanning the file. Name search uses the sorted
+    file index directly, like the in-memory name index.
+    The birthday scan is done once and keeps a small per-day index of file positions.
+    """
+    def __init__(self, path: str = None, record_type: type = None) -> None:
+        """
+        Args:
+            path (str): Book file to open, if any.
+            record_type (type): Class of the records created by the book.
+        """
+        super().__init__(record_type=record_type)
+        self.path = None
+        self.seq = 0
+        self._mm = None
+        self._count = 0
+        self._entry = None
+        self._deleted = set()
+        self._file_birthdays = None
+        if path is not None:
+            self.map(path)
+
+    @staticmethod
+    def is_mapped_file(path: str) -> bool:
+        """
+        Check whether the file is written in the mapped book format.
+        """
+        try:
+            with open(path, "rb") as f:
+                return f.read(len(MAGIC)) == MAGIC
+        except FileNotFoundError:
+            return False
+
+    def map(self, path: str) -> None:
+        """
+        Open the book file and use it as the on-disk part of the book.
+
+        Args:
+            path (str): Book file written by `save`.
+
+        Raises:
+            ValueError: If the file is not a mapped book file.
+        """
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, seq, count, name_size = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            mm.close()
+            raise ValueError(f"Not an address book file: {path}")
+
+        self.close()
+        self.path = path
+        self.seq = seq
+        self._mm = mm
+        self._count = count
+        self._entry = struct.Struct(f"<{name_size}sQ")
+        self._deleted = set()
+        self._file_birthdays = None
+
+    def close(self) -> None:
+        """
+        Unmap the book file.
+        """
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._count = 0
+
+    def save(self, path: str = None, seq: int = None) -> None:
+        """
+        Write the whole book into a new sorted file and map it.
+
+        Args:
+            path (str): Output file, defaults to the currently mapped file.
+            seq (int): Journal sequence number stored in the header.
+        """
+        path = path or self.path
+        if seq is not None:
+            self.seq = seq
+
+        # Three streaming passes: sizes, index and data.
+        count, name_size = 0, 1
+        for name, _, phones in self._merged():
+            count += 1
+            name_size = max(name_size, len(name))
+        entry = struct.Struct(f"<{name_size}sQ")
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.seq, count, name_size))
+            offset = HEADER.size + count * entry.size
+            for name, _, phones in self._merged():
+                f.write(entry.pack(name, offset))
+                offset += RECORD_HEAD.size + 8 * len(phones)
+            for _, birthday, phones in self._merged():
+                f.write(RECORD_HEAD.pack(birthday, len(phones)))
+                f.write(struct.pack(f"<{len(phones)}Q", *phones))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.close()
+        os.replace(tmp_path, path)
+        self.map(path)
+
+    def __getitem__(self, name: str) -> Record:
+        record = self.find(name)
+        if record is None:
+            raise KeyError(name)
+        return record
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        self._deleted.discard(name)
+        super().__setitem__(name, record)
+
+    def __delitem__(self, name: str) -> None:
+        in_file = self._in_file(name)
+        if name in self.data:
+            record = self.data.pop(name)
+            self._unindex(record)
+            self.name_index.remove(name)
+            record._book = None
+        elif not in_file:
+            raise KeyError(name)
+        if in_file:
+            self._deleted.add(name)
+        if self.journal is not None:
+            self.journal.append("delete", name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.data or self._in_file(name)
+
+    def __iter__(self):
+        for name, _ in self._file_entries():
+            if name not in self.data:
+                yield name
+        yield from list(self.data)
+
+    def __len__(self) -> int:
+        added = sum(1 for name in self.data if self._search(name) is None)
+        return self._count - len(self._deleted) + added
+
+    def __getstate__(self) -> dict:
+        raise TypeError("MappedAddressBook is persisted with save(), not pickle.")
+
+    def items(self):
+        """
+        Iterate over (name, record) pairs without adding the records to the working set.
+        """
+        for name, offset in self._file_entries():
+            if name not in self.data:
+                yield name, self._decode(name, offset)
+        yield from list(self.data.items())
+
+    def find(self, name: str) -> Record:
+        """
+        Find a record by name, decoding it from the file on first access.
+        """
+        record = self.data.get(name)
+        if record is not None or name in self._deleted:
+            return record
+        offset = self._search(name)
+        if offset is None:
+            return None
+        record = self._decode(name, offset)
+        self._attach(name, record)
+        return record
+
+    def find_by_phone(self, phone: str) -> Record:
+        """
+        Find a record by one of its phone numbers.
+        """
+        record = super().find_by_phone(phone)
+        if record is not None or not (phone.isdecimal() and len(phone) == 10):
+            return record
+        packed = int(phone)
+        for name, offset in self._file_entries():
+            if name not in self.data and packed in self._read(offset)[1]:
+                return self.find(name)
+        return None
+
+    def search(self, query: str, max_distance: int = 1, limit: int = 10) -> list[str]:
+        """
+        Find names starting with the query, followed by names within `max_distance` edits of it.
+
+        Args:
+            query (str): Full or partial name.
+            max_distance (int): Maximum edit distance for the fuzzy part of the result.
+            limit (int): Maximum number of returned names.
+
+        Returns:
+            list[str]: Matching names, prefix matches first.
+        """
+        names = self.name_index.complete(query, limit)
+        if self._mm is not None:
+            prefix = query.encode("utf-8")
+            for i in range(self._lower_bound(prefix), self._count):
+                entry_name, _ = self._entry.unpack_from(self._mm, HEADER.size + i * self._entry.size)
+                if not entry_name.startswith(prefix):
+                    break
+                name = entry_name.rstrip(b"\0").decode("utf-8")
+                if name not in self._deleted and name not in self.data:
+                    names.append(name)
+                    if len(names) >= 2 * limit:
+                        break
+            names = sorted(names)[:limit]
+
+        if len(names) < limit:
+            matches = self.name_index.fuzzy(query, max_distance, limit)
+            if self._mm is not None:
+                matches += [(name, distance) for name, distance in fuzzy(_FileNames(self), query, max_distance)
+                            if name not in self._deleted and name not in self.data]
+            for name, _ in sorted(matches, key=lambda match: (match[1], match[0])):
+                if len(names) >= limit:
+                    break
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def delete(self, name: str) -> None:
+        """
+        Delete a record by name.
+        """
+        if name in self:
+            del self[name]
+
+    def _born_on(self, month: int, day: int):
+        # Birthdays of the file records are bucketed on first use by the position of the
+        # record in the file index (4 bytes per record with a birthday, not a name string);
+        # the names are decoded only for the requested day.
+        if self._file_birthdays is None:
+            self._file_birthdays = {}
+            for i in range(self._count):
+                _, offset = self._entry.unpack_from(self._mm, HEADER.size + i * self._entry.size)
+                birthday, _ = self._read(offset)
+                if birthday:
+                    bday = date.fromordinal(birthday)
+                    self._file_birthdays.setdefault((bday.month, bday.day), array("I")).append(i)
+
+        names = list(super()._born_on(month, day))
+        for i in self._file_birthdays.get((month, day), ()):
+            name = self._entry_name(i)
+            if name not in self.data and name not in self._deleted:
+                names.append(name)
+        return names
+
+    def _in_file(self, name: str) -> bool:
+        return name not in self._deleted and self._search(name) is not None
+
+    def _search(self, name: str) -> int:
+        """
+        Binary search of the name in the file index, returns the record data offset.
+        """
+        if self._mm is None:
+            return None
+        key = name.encode("utf-8")
+        if len(key) > self._entry.size - 8:
+            return None
+        key = key.ljust(self._entry.size - 8, b"\0")
+
+        index = self._lower_bound(key)
+        if index < self._count:
+            entry_name, offset = self._entry.unpack_from(self._mm, HEADER.size + index * self._entry.size)
+            if entry_name == key:
+                return offset
+        return None
+
+    def _lower_bound(self, key: bytes) -> int:
+        """
+        Index of the first file entry whose (padded) name is not less than the key.
+        """
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry_name, _ = self._entry.unpack_from(self._mm, HEADER.size + mid * self._entry.size)
+            if entry_name < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _entry_name(self, index: int) -> str:
+        entry_name, _ = self._entry.unpack_from(self._mm, HEADER.size + index * self._entry.size)
+        return entry_name.rstrip(b"\0").decode("utf-8")
+
+    def _file_entries(self):
+        """
+        Iterate over (name, data offset) pairs of the file records which are not deleted.
+        """
+        for i in range(self._count):
+            entry_name, offset = self._entry.unpack_from(self._mm, HEADER.size + i * self._entry.size)
+            name = entry_name.rstrip(b"\0").decode("utf-8")
+            if name not in self._deleted:
+                yield name, offset
+
+    def _read(self, offset: int) -> tuple[int, tuple[int, ...]]:
+        birthday, count = RECORD_HEAD.unpack_from(self._mm, offset)
+        return birthday, struct.unpack_from(f"<{count}Q", self._mm, offset + RECORD_HEAD.size)
+
+    def _decode(self, name: str, offset: int) -> Record:
+        birthday, phones = self._read(offset)
+        record = self.new_record(name)
+        for phone in phones:
+            record.add_phone(f"{phone:010d}")
+        if birthday:
+            record.add_birthday(date.fromordinal(birthday))
+        return record
+
+    def _merged(self):
+        """
+        Iterate over (encoded name, birthday ordinal, phones) of all records sorted by name.
+        """
+        def from_file():
+            for name, offset in self._file_entries():
+                if name not in self.data:
+                    birthday, phones = self._read(offset)
+                    yield name.encode("utf-8"), birthday, phones
+
+        def from_memory():
+            for name in sorted(self.data, key=lambda n: n.encode("utf-8")):
+                record = self.data[name]
+                birthday = record.birthday.value.toordinal() if record.birthday is not None else 0
+                yield name.encode("utf-8"), birthday, [int(phone.value) for phone in record.phones]
+
+        return heapq.merge(from_file(), from_memory(), key=lambda item: item[0])
+
+class _FileNames:
+    """
+    Read-only sorted sequence of the names in the file index of a mapped book, deleted ones included.
+    """
+    __slots__ = ("book",)
+
+    def __init__(self, book: MappedAddressBook) -> None:
+        self.book = book
+
+    def __len__(self) -> int:
+        return self.book._count
+
+    def __getitem__(self, index: int) -> str:
+        return self.book._entry_name(index)
@@ -0,0 +1,165 @@
+from bisect import bisect_left, insort
+from typing import Optional, Sequence
+
+# Upper bound for the names with a given prefix: prefix + MAX_CHAR sorts after all of them.
+MAX_CHAR = "\U0010ffff"
+
+def prefix_range(names: Sequence[str], prefix: str, lo: int = 0, hi: Optional[int] = None) -> tuple[int, int]:
+    """
+    Range of the sorted names starting with the prefix.
+
+    Args:
+        names (Sequence[str]): Sorted names.
+        prefix (str): Beginning of the names.
+        lo (int), hi (int): Part of `names` to search in.
+
+    Returns:
+        tuple[int, int]: Start and end of the range.
+    """
+    hi = len(names) if hi is None else hi
+    start = bisect_left(names, prefix, lo, hi)
+    return start, bisect_left(names, prefix + MAX_CHAR, start, hi)
+
+def contains(names: Sequence[str], name: str, lo: int = 0, hi: Optional[int] = None) -> bool:
+    """
+    Binary search of the name in the sorted names.
+    """
+    hi = len(names) if hi is None else hi
+    index = bisect_left(names, name, lo, hi)
+    return index < hi and names[index] == name
+
+def complete(names: Sequence[str], prefix: str, limit: int = 10) -> list[str]:
+    """
+    Find the sorted names starting with the prefix.
+
+    Returns:
+        list[str]: Up to `limit` matching names in lexicographic order.
+    """
+    start, end = prefix_range(names, prefix)
+    return [names[i] for i in range(start, min(end, start + limit))]
+
+def _children(names: Sequence[str], depth: int, lo: int, hi: int):
+    """
+    Groups the sorted names `names[lo:hi]`, sharing a prefix of `depth` characters, by their next character.
+
+    The names are used as an implicit trie: each group is found with one binary search.
+
+    Yields:
+        tuple[str, int, int]: The next character and the range of names having it.
+    """
+    while lo < hi and len(names[lo]) == depth:
+        lo += 1     # the prefix itself sorts first
+    while lo < hi:
+        name = names[lo]
+        end = bisect_left(names, name[:depth + 1] + MAX_CHAR, lo, hi)
+        yield name[depth], lo, end
+        lo = end
+
+def fuzzy(names: Sequence[str], word: str, max_distance: int = 1) -> list[tuple[str, int]]:
+    """
+    Find the sorted names within the Levenshtein distance from the word.
+
+    The names are walked as an implicit trie along the word: following the next character
+    of the word is free, while substitutions, insertions (of the characters present in the
+    names sharing the prefix) and deletions spend one edit each. Once the edits are spent,
+    the rest of the word is checked with a single binary search, so the lookup visits
+    O((len(word) * branching) ** max_distance) prefixes instead of all the names.
+
+    Args:
+        names (Sequence[str]): Sorted names.
+        word (str): Word to look up.
+        max_distance (int): Maximum allowed edit distance.
+
+    Returns:
+        list[tuple[str, int]]: Pairs of name and distance, closest first.
+    """
+    matches = {}
+    best = {}   # (position in word, prefix length, name range) -> fewest edits it was reached with
+    stack = [(0, 0, len(names), 0, 0)]
+    while stack:
+        i, lo, hi, depth, used = stack.pop()
+        if best.get((i, depth, lo, hi), max_distance + 1) <= used:
+            continue
+        best[i, depth, lo, hi] = used
+
+        # names[lo:hi] share a prefix of `depth` characters matched with word[:i].
+        prefix = names[lo][:depth] if lo < hi else ""
+        candidate = prefix + word[i:]
+        if contains(names, candidate, lo, hi) and matches.get(candidate, max_distance + 1) > used:
+            matches[candidate] = used
+        if used == max_distance:
+            continue
+
+        if i < len(word):
+            stack.append((i + 1, lo, hi, depth, used + 1))                         # deletion
+        for char, start, end in _children(names, depth, lo, hi):
+            if i < len(word):
+                cost = 0 if char == word[i] else 1
+                stack.append((i + 1, start, end, depth + 1, used + cost))          # match or substitution
+            stack.append((i, start, end, depth + 1, used + 1))                     # insertion
+    return sorted(matches.items(), key=lambda match: (match[1], match[0]))
+
+class NameIndex:
+    """
+    Sorted list of contact names supporting prefix completion and bounded edit distance lookup.
+
+    New names go to a small sorted list first, which is merged into the main one once it
+    grows over 1/64 of it (at least `merge_size`), so adding a name does not move the whole
+    list. The index holds references to the names only, not copies.
+    """
+    def __init__(self, names=(), merge_size: int = 1024) -> None:
+        self.names = sorted(names)
+        self.recent = []
+        self.merge_size = merge_size
+
+    def __len__(self) -> int:
+        return len(self.names) + len(self.recent)
+
+    def __contains__(self, name: str) -> bool:
+        return contains(self.names, name) or contains(self.recent, name)
+
+    def add(self, name: str) -> None:
+        """
+        Add a name to the index.
+        """
+        if name in self:
+            return
+        insort(self.recent, name)
+        if len(self.recent) >= max(self.merge_size, len(self.names) // 64):
+            self.names += self.recent
+            self.names.sort()
+            self.recent = []
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a name from the index.
+        """
+        for names in (self.recent, self.names):
+            index = bisect_left(names, name)
+            if index < len(names) and names[index] == name:
+                del names[index]
+                return
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Find names starting with the prefix.
+
+        Args:
+            prefix (str): Beginning of the name.
+            limit (int): Maximum number of returned names.
+
+        Returns:
+            list[str]: Matching names in lexicographic order.
+        """
+        return sorted(complete(self.names, prefix, limit) + complete(self.recent, prefix, limit))[:limit]
+
+    def fuzzy(self, word: str, max_distance: int = 1, limit: int = 10) -> list[tuple[str, int]]:
+        """
+        Find names within the Levenshtein distance from the word (see `fuzzy`).
+
+        Returns:
+            list[tuple[str, int]]: Up to `limit` pairs of name and distance, closest first.
+        """
+        matches = fuzzy(self.names, word, max_distance) + fuzzy(self.recent, word, max_distance)
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches[:limit]
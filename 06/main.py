@@ -1,7 +1,16 @@
 import os
+import io
+import sys
+import time
+import argparse
+import inspect
+from contextlib import redirect_stdout
 from functools import wraps
 from booklib.entities import *
-from typing import Callable, Dict, List, Tuple, Any
+from booklib.journal import BookJournal
+from booklib.compact import CompactRecord
+from booklib.mapped import MappedAddressBook
+from typing import Callable, Dict, List, Tuple, Any, TextIO, NamedTuple, Optional
 
 def input_error(func: Callable) -> Callable:
     """
@@ -25,12 +34,67 @@ def input_error(func: Callable) -> Callable:
             return str(ie)
     return inner
 
+class CommandSpec(NamedTuple):
+    """
+    Registered bot command.
+
+    Attributes:
+        name -- primary command name
+        invoke -- handler adapted to the (args, book) call convention
+        usage -- arguments description shown on wrong arity
+        min_args -- minimum number of arguments
+        max_args -- maximum number of arguments, None if not limited
+    """
+    name: str
+    invoke: Callable[[List[str], AddressBook], Optional[str]]
+    usage: str
+    min_args: int
+    max_args: Optional[int]
+
+# Command name -> registered command, filled by the `command` decorator.
+COMMANDS: Dict[str, CommandSpec] = {}
+
+def command(*names: str, usage: str = "", min_args: int = 0, max_args: Optional[int] = None) -> Callable:
+    """
+    Decorator registering a handler for one or more command names.
+
+    The handler may take `(args, book)`, `(book)` or no parameters; the adapter calling
+    it with the right arguments is built once, at registration.
+
+    Args:
+        names (str): Command names handled by the function.
+        usage (str): Arguments description, e.g. '<name> <phone>'.
+        min_args (int): Minimum number of arguments.
+        max_args (int): Maximum number of arguments, None if not limited.
+
+    Returns:
+        Callable: Decorator returning the handler unchanged.
+    """
+    def register(func: Callable) -> Callable:
+        params = list(inspect.signature(func).parameters)
+        if params == ['args', 'book']:
+            invoke = func
+        elif params == ['book']:
+            invoke = lambda args, book: func(book)
+        elif not params:
+            invoke = lambda args, book: func()
+        else:
+            raise TypeError(f"Unsupported handler signature: {func.__name__}{params}")
+
+        spec = CommandSpec(names[0], invoke, usage, min_args, max_args)
+        for name in names:
+            COMMANDS[name] = spec
+        return func
+    return register
+
+@command('hello')
 def hello() -> str:
     """
     Returns a greeting message.
     """
     return "How can I help you?"
 
+@command('add', usage='<name> <phone>', min_args=2)
 @input_error
 def add_contact(args: List[str], book: AddressBook) -> str:
     """
@@ -47,13 +111,14 @@ def add_contact(args: List[str], book: AddressBook) -> str:
     record = book.find(name)
     message = "Contact updated."
     if record is None:
-        record = Record(name)
+        record = book.new_record(name)
         book.add_record(record)
         message = "Contact added."
     if phone:
         record.add_phone(phone)
     return message
 
+@command('change', usage='<name> <old phone> <new phone>', min_args=3, max_args=3)
 @input_error
 def change_contact(args: List[str], book: AddressBook) -> str:
     """
@@ -72,11 +137,12 @@ def change_contact(args: List[str], book: AddressBook) -> str:
         record.edit_phone(old_phone, new_phone)
         return "Phone changed."
     else:
-        record = Record(name)
+        record = book.new_record(name)
         record.add_phone(new_phone)
         book.add_record(record)
         return "Contact added."
 
+@command('phone', usage='<name>', min_args=1)
 @input_error
 def show_phone(args: List[str], book: AddressBook) -> str:
     """
@@ -97,6 +163,7 @@ def show_phone(args: List[str], book: AddressBook) -> str:
     else:
         raise booklibex.RecordNotFoundException(args[0])
 
+@command('all')
 @input_error
 def show_all(book: AddressBook) -> None:
     """
@@ -108,6 +175,7 @@ def show_all(book: AddressBook) -> None:
     for user_name, user_info in book.items():
         print(f"{user_name:<12} : {user_info.show_phones()}")
 
+@command('add-birthday', usage='<name> <DD.MM.YYYY>', min_args=2)
 @input_error
 def add_birthday(args: List[str], book: AddressBook) -> str:
     """
@@ -128,6 +196,7 @@ def add_birthday(args: List[str], book: AddressBook) -> str:
     else:
         raise booklibex.RecordNotFoundException(name)
 
+@command('show-birthday', usage='<name>', min_args=1)
 @input_error
 def show_birthday(args: List[str], book: AddressBook) -> str:
     """
@@ -147,6 +216,7 @@ def show_birthday(args: List[str], book: AddressBook) -> str:
     else:
         raise booklibex.RecordNotFoundException(name)
 
+@command('birthdays')
 def birthdays(book: AddressBook) -> None:
     """
     Prints the birthdays of contacts that happens in the next 7 days.
@@ -157,6 +227,44 @@ def birthdays(book: AddressBook) -> None:
     for birthdays in book.get_upcoming_birthdays():
         print(birthdays)
 
+@command('delete', usage='<name>', min_args=1)
+@input_error
+def delete_contact(args: List[str], book: AddressBook) -> str:
+    """
+    Deletes a contact.
+
+    Args:
+        args (List[str]): List containing the contact name.
+        book (AddressBook): The address book to delete the contact from.
+
+    Returns:
+        str: Message indicating the result.
+    """
+    name, *_ = args
+    if name not in book:
+        raise booklibex.RecordNotFoundException(name)
+    book.delete(name)
+    return "Contact deleted."
+
+@command('search', usage='<query>', min_args=1, max_args=1)
+def search_contacts(args: List[str], book: AddressBook) -> str:
+    """
+    Finds contacts by a partial or misspelled name.
+
+    Args:
+        args (List[str]): List containing the query.
+        book (AddressBook): The address book to search in.
+
+    Returns:
+        str: Matching contacts with their phone numbers, one per line.
+    """
+    lines = []
+    for name in book.search(args[0]):
+        record = book.find(name)
+        if record is not None:
+            lines.append(f"{name:<12} : {record.show_phones()}")
+    return "\n".join(lines) if lines else "No contacts found."
+
 def close() -> str:
     """
     Returns a goodbye message when program is closing.
@@ -181,8 +289,104 @@ def parse_input(user_input: str) -> Tuple[str, List[str]]:
     cmd = cmd.strip().lower()
     return cmd, *args
 
+def execute(command: str, args: List[str], book: AddressBook) -> str:
+    """
+    Executes a single command through the command registry.
+
+    Args:
+        command (str): The command name.
+        args (List[str]): The command arguments.
+        book (AddressBook): The address book the command works with.
+
+    Returns:
+        str: Output of the command, None if the command printed its output itself.
+    """
+    spec = COMMANDS.get(command)
+    if spec is None:
+        return "Invalid command."
+    if len(args) < spec.min_args or (spec.max_args is not None and len(args) > spec.max_args):
+        return f"Usage: {command} {spec.usage}".rstrip()
+    return spec.invoke(args, book)
+
+def run_batch(stream: TextIO, book: AddressBook, flush_every: int = 10000) -> None:
+    """
+    Executes commands read from a stream.
+
+    Output is buffered and written in blocks of `flush_every` commands. Journal fsyncs
+    and compactions are deferred until the stream ends or 'close'/'exit' is read; then
+    the journal is synced once and compacted only if it reached its usual threshold.
+    Throughput is reported to stderr.
+
+    Args:
+        stream (TextIO): Stream with one command per line.
+        book (AddressBook): The address book the commands work with.
+        flush_every (int): Number of commands between two writes of the output buffer.
+    """
+    journal = book.journal
+    if journal is not None:
+        batch_size, compact_every = journal.batch_size, journal.compact_every
+        journal.batch_size = journal.compact_every = 0
+
+    stdout = sys.stdout
+    buffer = io.StringIO()
+    count = 0
+    start = time.perf_counter()
+
+    try:
+        with redirect_stdout(buffer):
+            for line in stream:
+                line = line.strip().lower()
+                if not line:
+                    continue
+                command, *args = parse_input(line)
+                if command in ['close', 'exit']:
+                    break
+                try:
+                    output = execute(command, args, book)
+                    if output is not None:
+                        print(output)
+                except Exception as ex:
+                    print(f"Unexpected error: {str(ex)}")
+
+                count += 1
+                if count % flush_every == 0:
+                    stdout.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+    finally:
+        stdout.write(buffer.getvalue())
+        stdout.flush()
+        if journal is not None:
+            journal.batch_size, journal.compact_every = batch_size, compact_every
+            journal.sync()
+            journal.maybe_compact()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else float('inf')
+    print(f"Processed {count} commands in {elapsed:.3f}s ({rate:.0f} commands/s).", file=sys.stderr)
+
 def main() -> None:
-    book = restore_address_book()
+    arg_parser = argparse.ArgumentParser(description="Assistant bot for managing the address book.")
+    arg_parser.add_argument('-b', '--batch', type=str, help="Execute commands from the file ('-' for stdin) and exit.")
+    cli_args = arg_parser.parse_args()
+
+    # BOOKLIB_COMPACT=1 stores new books with memory-compact records,
+    # BOOKLIB_MAPPED=1 keeps new books in a memory-mapped file loaded on demand.
+    compact = os.environ.get("BOOKLIB_COMPACT") == "1"
+    mapped = os.environ.get("BOOKLIB_MAPPED") == "1"
+    book = restore_address_book(compact=compact, mapped=mapped)
+
+    if cli_args.batch:
+        try:
+            if cli_args.batch == '-':
+                run_batch(sys.stdin, book)
+            else:
+                with open(cli_args.batch, 'r', encoding='utf-8') as f:
+                    run_batch(f, book)
+        finally:
+            save_address_book(book)
+        return
+
     print("Welcome to the assistance bot!")
 
     while True:
@@ -193,53 +397,49 @@ def main() -> None:
             if command in ['close', 'exit']:
                 print(close())
                 break
-            elif command == 'hello':
-                print(hello())
-            elif command == 'add':
-                print(add_contact(args, book))
-            elif command == 'change':
-                print(change_contact(args, book))
-            elif command == 'phone':
-                print(show_phone(args, book))
-            elif command == 'all':
-                show_all(book)
-            elif command == 'add-birthday':
-                print(add_birthday(args, book))
-            elif command == 'show-birthday':
-                print(show_birthday(args, book))
-            elif command == 'birthdays':
-                birthdays(book)
-            else:
-                print("Invalid command.")
+
+            output = execute(command, args, book)
+            if output is not None:
+                print(output)
         except Exception as ex:
             print(f"Unexpected error: {str(ex)}")
 
     save_address_book(book)
 
-def restore_address_book(filename="addressbook.pkl") -> AddressBook:
-    """Restores the address book information from file.
+def restore_address_book(filename="addressbook.pkl", compact=False, mapped=False) -> AddressBook:
+    """Restores the address book information from the snapshot file and replays its journal.
     
     Args:
-        filename (str): The name of the file from which data should be restored.
+        filename (str): The name of the snapshot file from which data should be restored.
+        compact (bool): Use `CompactRecord` records if a new book has to be created.
+        mapped (bool): Create a new book as `MappedAddressBook`, whose snapshot is a
+            memory-mapped file. Existing mapped snapshots are always opened this way.
 
     Returns:
-        (AddressBook): deserialized (restored) address book with a state a previously closed session.
+        (AddressBook): restored address book with a state a previously closed session.
+            Further changes of the book are written into the journal.
     """
-    try:
-        with open(filename, "rb") as f:
-            return pickle.load(f)
-    except FileNotFoundError:
-        return AddressBook()
+    record_type = CompactRecord if compact else Record
+    book_type = MappedAddressBook if mapped else AddressBook
+    return BookJournal(filename).open(lambda: book_type(record_type=record_type))
 
 def save_address_book(book: AddressBook, filename="addressbook.pkl") -> None:
-    """Saves the address book in binary format into the file.
+    """Saves the address book.
+
+    Books restored by `restore_address_book` are already journaled, so only the
+    pending journal entries are synced. Other books are written as a full snapshot.
     
     Args:
         book (AddressBook): object of the address book to be saved.
-        filename (str): name of the output file.
+        filename (str): name of the output snapshot file.
     """
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
+    if book.journal is not None:
+        book.journal.close()
+    else:
+        journal = BookJournal(filename)
+        journal.write_snapshot(book)
+        # Entries of the previous journal are already part of the new snapshot.
+        open(journal.journal_path, "w").close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file